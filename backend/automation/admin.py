@@ -4,19 +4,43 @@ from .models import Connector, DeviceEndpoint, Room, Device, Integration
 @admin.register(Room)
 class RoomAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'owner', 'slug', 'created_at')
+    list_select_related = ('owner',)
     search_fields = ('name', 'slug', 'owner__username')
 
+    def get_queryset(self, request):
+        # Covers change forms too, where list_select_related does not apply
+        return super().get_queryset(request).select_related('owner')
+
 
 @admin.register(Device)
 class DeviceAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'device_type', 'room', 'is_on')
-    list_filter = ('device_type', 'integration', 'is_on')
+    list_select_related = ('room', 'state')
+    list_filter = ('device_type', 'integration', 'state__is_on')
+    search_fields = ('name', 'room__name')
+    # Lazy FK picker instead of loading every Room into a <select>
+    autocomplete_fields = ('room',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            'room', 'room__owner', 'state'
+        )
+
+    @admin.display(boolean=True, description='is on')
+    def is_on(self, obj):
+        state = getattr(obj, 'state', None)
+        return state.is_on if state is not None else False
 
 
 @admin.register(Integration)
 class IntegrationAdmin(admin.ModelAdmin):
     list_display = ('id', 'display_name', 'provider', 'owner', 'created_at')
+    list_select_related = ('owner',)
     list_filter = ('provider',)
+    search_fields = ('display_name', 'owner__username')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('owner')
 
 
 
@@ -36,9 +60,14 @@ class ConnectorAdmin(admin.ModelAdmin):
         "is_active",
         "created_at",
     )
+    list_select_related = ("owner",)
     list_filter = ("connector_type", "is_active")
     search_fields = ("name", "owner__username")
     readonly_fields = ("created_at", "updated_at")
+    autocomplete_fields = ("integration",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("owner", "integration")
 
 
 @admin.register(DeviceEndpoint)
@@ -47,4 +76,11 @@ class DeviceEndpointAdmin(admin.ModelAdmin):
         "id",
         "device",
         "connector",
-    )
\ No newline at end of file
+    )
+    list_select_related = ("device", "connector")
+    autocomplete_fields = ("device", "connector", "integration")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            "device", "device__room", "connector", "integration"
+        )
\ No newline at end of file
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class AutomationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'automation'
\ No newline at end of file
+    name = 'automation'
+
+    def ready(self):
+        from . import signals  # noqa: F401
\ No newline at end of file
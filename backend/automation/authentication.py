@@ -0,0 +1,32 @@
+"""
+Token authentication with a short cache in front of the token table.
+
+Every authenticated request otherwise costs one SELECT against
+authtoken_token joined to auth_user; with dashboard polling and
+websocket handshakes that query dominates auth cost. Tokens here are
+long-lived, so a 5 minute cache of the resolved token (user attached)
+is safe — logout deletes the cache entry along with the token.
+"""
+from django.core.cache import cache
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+TOKEN_CACHE_SECONDS = 300
+
+
+def token_cache_key(key):
+    return f"tok:{key}"
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        token = cache.get(cache_key)
+        if token is not None:
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed("User inactive or deleted.")
+            return (token.user, token)
+
+        user, token = super().authenticate_credentials(key)
+        cache.set(cache_key, token, TOKEN_CACHE_SECONDS)
+        return (user, token)
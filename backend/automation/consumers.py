@@ -1,13 +1,58 @@
-import json
-from channels.generic.websocket import AsyncWebsocketConsumer, AsyncJsonWebsocketConsumer
+import orjson
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.db.models import F
 from .models import Device
-from .serializers import DeviceSerializer  # adjust to your actual serializer
+
+# Flat columns the frontend consumes; no nested room/endpoints, so the
+# snapshot is one projection query with zero serializer overhead. The
+# hot columns live on DeviceState and are pulled in via F() annotations
+# so the wire shape stays flat.
+SNAPSHOT_FIELDS = (
+    "id",
+    "room_id",
+    "name",
+    "device_type",
+    "device_kind",
+    "signal_type",
+    "unit",
+    "min_value",
+    "max_value",
+    "decimal_places",
+    "is_percentage",
+    "integration",
+    "external_id",
+    "location",
+    "position_x",
+    "position_y",
+    "is_active",
+)
+
+# The choice columns are stored as SlugChoices ints; the frontend still
+# compares against the string slugs, so the snapshot maps them back.
+_CHOICE_SLUGS = {
+    "device_type": Device.DeviceType.slug_map(),
+    "device_kind": Device.DeviceKind.slug_map(),
+    "signal_type": Device.SignalType.slug_map(),
+    "integration": Device.IntegrationKind.slug_map(),
+}
+
 
 class RoomConsumer(AsyncJsonWebsocketConsumer):
+    @classmethod
+    async def encode_json(cls, content):
+        # orjson also handles the datetime values .values() returns
+        return orjson.dumps(content).decode()
+
+    @classmethod
+    async def decode_json(cls, text_data):
+        return orjson.loads(text_data)
+
     async def connect(self):
         self.room_id = self.scope["url_route"]["kwargs"]["room_id"]
         self.room_group_name = f"room_{self.room_id}"
+        # per-device groups this client subscribed to (device_<id>)
+        self.device_groups = set()
 
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
@@ -19,17 +64,59 @@ class RoomConsumer(AsyncJsonWebsocketConsumer):
             "devices": devices,
         })
 
+    async def receive_json(self, content):
+        """
+        Clients may narrow their update stream to specific devices:
+
+            {"subscribe": [1, 2, 3]}
+            {"unsubscribe": [2]}
+
+        Updates for subscribed devices arrive via the device_<id> groups;
+        the room group continues to carry updates for the whole room.
+        """
+        for device_id in content.get("subscribe", []):
+            group = f"device_{int(device_id)}"
+            if group not in self.device_groups:
+                self.device_groups.add(group)
+                await self.channel_layer.group_add(group, self.channel_name)
+
+        for device_id in content.get("unsubscribe", []):
+            group = f"device_{int(device_id)}"
+            if group in self.device_groups:
+                self.device_groups.discard(group)
+                await self.channel_layer.group_discard(group, self.channel_name)
+
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+        for group in self.device_groups:
+            await self.channel_layer.group_discard(group, self.channel_name)
 
     @database_sync_to_async
     def get_devices(self):
-        qs = Device.objects.filter(room_id=self.room_id)
-        return DeviceSerializer(qs, many=True).data
+        devices = list(
+            Device.objects.filter(room_id=self.room_id).values(
+                *SNAPSHOT_FIELDS,
+                last_value=F("state__last_value"),
+                last_value_raw=F("state__last_value_raw"),
+                last_updated_at=F("state__last_updated_at"),
+                is_on=F("state__is_on"),
+            )
+        )
+        for row in devices:
+            for field, slugs in _CHOICE_SLUGS.items():
+                row[field] = slugs.get(row[field], row[field])
+        return devices
 
     # handler for messages sent via group_send
     async def device_update(self, event):
         await self.send_json({
             "type": "device_update",
             "device": event["device"],
+        })
+
+    # aggregated handler: one WS frame carrying many device updates
+    async def device_updates_batch(self, event):
+        await self.send_json({
+            "type": "device_updates_batch",
+            "updates": event["updates"],
         })
\ No newline at end of file
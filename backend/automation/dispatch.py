@@ -0,0 +1,100 @@
+"""
+In-process connector write queue.
+
+Actuator commands hand their raw value to a bounded queue and return;
+a single daemon writer thread drains it and talks to the connector, so
+the request never waits on broker I/O and there is no task broker
+round-trip. When the queue is full the API answers 503 instead of
+buffering without bound — backpressure is explicit.
+"""
+import logging
+import queue
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+QUEUE_MAX = 1024
+QueueFull = queue.Full
+
+ConnectorWrite = namedtuple(
+    "ConnectorWrite", ["connector_id", "address", "raw_value"]
+)
+
+_queue = queue.Queue(maxsize=QUEUE_MAX)
+_writer_lock = threading.Lock()
+_writer = None
+
+
+def enqueue_write(connector_id, address, raw_value):
+    """
+    Queue one connector write without blocking; raises QueueFull when
+    the writer can't keep up. Starts the writer thread on first use.
+    """
+    _ensure_writer()
+    _queue.put_nowait(ConnectorWrite(connector_id, address, raw_value))
+
+
+def _ensure_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(
+                    target=_writer_loop, name="connector-writer", daemon=True
+                )
+                _writer.start()
+
+
+def _writer_loop():
+    while True:
+        write = _queue.get()
+        try:
+            _dispatch(write)
+        except Exception:
+            logger.exception("Connector write failed: %r", write)
+        finally:
+            _queue.task_done()
+
+
+def _dispatch(write):
+    # Imported lazily: this module is pulled in by views before the app
+    # registry is fully ready in some import orders.
+    from .models import Connector
+
+    connector = (
+        Connector.objects.only("id", "connector_type", "host", "port")
+        .filter(pk=write.connector_id)
+        .first()
+    )
+    if connector is None:
+        logger.warning(
+            "Dropping write to missing connector %s", write.connector_id
+        )
+        return
+
+    if connector.connector_type == Connector.ConnectorType.MQTT:
+        _publish_mqtt(connector, write)
+    else:
+        logger.info(
+            "No writer for connector type %s; dropping write to %s",
+            Connector.ConnectorType(connector.connector_type).slug,
+            write.address,
+        )
+
+
+def _publish_mqtt(connector, write):
+    import paho.mqtt.publish as mqtt_publish
+
+    mqtt_publish.single(
+        write.address,
+        payload=str(write.raw_value),
+        hostname=connector.host or "mqtt",
+        port=connector.port or 1883,
+    )
+    logger.debug(
+        "Published %s to %s via connector %s",
+        write.raw_value,
+        write.address,
+        connector.pk,
+    )
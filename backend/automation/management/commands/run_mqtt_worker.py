@@ -1,24 +1,152 @@
 # backend/automation/management/commands/run_mqtt_worker.py
-import json
+import asyncio
 import os
+import queue
+import threading
 import time
 import logging
 
+import numpy as np
+import orjson
 import paho.mqtt.client as mqtt
 from django.core.management.base import BaseCommand
+from django.db import connections, transaction
 from django.utils import timezone
 
-from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
-from automation.models import DeviceEndpoint, Device
-from automation.serializers import DeviceSerializer  # adjust import if your serializer is elsewhere
+from automation.models import Connector, DeviceEndpoint, Device, DeviceState
 
 logger = logging.getLogger(__name__)
 
 MQTT_HOST = os.getenv("MQTT_HOST", os.getenv("MQTT_BROKER_HOST", "mqtt"))
 MQTT_PORT = int(os.getenv("MQTT_PORT", os.getenv("MQTT_BROKER_PORT", "1883")))
 
+# How often (seconds) to re-read endpoints from the DB into the in-memory
+# topic map. Endpoints change rarely; messages arrive constantly.
+TOPIC_MAP_REFRESH_SECONDS = int(os.getenv("MQTT_TOPIC_MAP_REFRESH", "30"))
+
+# Batching knobs for the background writer: flush whenever either the
+# time window elapses or the batch reaches this many messages.
+WRITE_QUEUE_MAXSIZE = int(os.getenv("MQTT_WRITE_QUEUE_MAXSIZE", "10000"))
+FLUSH_WINDOW_SECONDS = float(os.getenv("MQTT_FLUSH_WINDOW_MS", "100")) / 1000.0
+FLUSH_MAX_MESSAGES = int(os.getenv("MQTT_FLUSH_MAX_MESSAGES", "500"))
+
+# Minimum spacing between WebSocket broadcast flushes. Chatty sensors
+# overwrite their pending entry in between, so each device is serialized
+# and published at most once per interval.
+BROADCAST_FLUSH_SECONDS = float(os.getenv("MQTT_BROADCAST_FLUSH_MS", "100")) / 1000.0
+
+# How often the writer thread recycles stale/broken DB connections.
+DB_MAINTENANCE_SECONDS = 60.0
+
+# Deadband for broadcasts: suppress a device's WebSocket update when the
+# scaled value moved less than this since the last broadcast. 0 keeps
+# the historical behavior of broadcasting every change.
+BROADCAST_DEADBAND = float(os.getenv("MQTT_BROADCAST_DEADBAND", "0"))
+
+# last_value_raw is a debugging aid; persisting the full payload on every
+# tick just amplifies the UPDATE. Write it at most this often per device
+# (0 restores write-on-every-message).
+RAW_WRITE_SECONDS = float(os.getenv("MQTT_RAW_WRITE_SECONDS", "60"))
+
+
+def _common_topic_prefix(topics):
+    """
+    Longest common '/'-aligned, wildcard-free prefix of the given topics,
+    or "" when they share nothing.
+    """
+    split = [t.split("/") for t in topics]
+    prefix = []
+    for levels in zip(*split):
+        first = levels[0]
+        if first in ("+", "#") or any(level != first for level in levels):
+            break
+        prefix.append(first)
+    return "/".join(prefix)
+
+
+def _iso(dt):
+    """Render a datetime the way DRF does (Z suffix for UTC)."""
+    if dt is None:
+        return None
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _serialize_device_delta(device):
+    """
+    Lean broadcast payload: only the fields telemetry actually changes.
+
+    Clients merge this into the device they already hold from the
+    connect-time snapshot, so the immutable metadata (name, type,
+    position, …) never travels per message.
+
+    last_value & co. are the in-flight attributes _flush stashes on the
+    instance; is_on lives on the DeviceState row (joined at topic-map
+    refresh time) and only changes through the command endpoint.
+    """
+    state = getattr(device, "state", None)
+    return {
+        "id": device.id,
+        "last_value": device.last_value,
+        "last_value_raw": device.last_value_raw,
+        "last_updated_at": _iso(device.last_updated_at),
+        "unit": device.unit,
+        "is_on": state.is_on if state is not None else False,
+    }
+
+
+class TopicTrie:
+    """
+    Subscription trie for MQTT topic matching, supporting `+` (single
+    level) and `#` (multi level) wildcards like a broker-side
+    subscription tree. Lookup walks one node per topic level instead of
+    string-comparing every subscribed pattern.
+    """
+
+    __slots__ = ("children", "plus", "hash_endpoints", "endpoints")
+
+    def __init__(self):
+        self.children = {}
+        self.plus = None
+        self.hash_endpoints = []  # endpoints subscribed via a trailing '#'
+        self.endpoints = []  # endpoints terminating exactly at this node
+
+    def insert(self, topic, endpoint):
+        node = self
+        for level in topic.split("/"):
+            if level == "#":
+                node.hash_endpoints.append(endpoint)
+                return
+            if level == "+":
+                if node.plus is None:
+                    node.plus = TopicTrie()
+                node = node.plus
+            else:
+                child = node.children.get(level)
+                if child is None:
+                    child = node.children[level] = TopicTrie()
+                node = child
+        node.endpoints.append(endpoint)
+
+    def match(self, topic):
+        """Return all endpoints whose subscription matches `topic`."""
+        matches = []
+        self._match(topic.split("/"), 0, matches)
+        return matches
+
+    def _match(self, levels, i, out):
+        # '#' at this node matches the remainder (including zero levels)
+        out.extend(self.hash_endpoints)
+        if i == len(levels):
+            out.extend(self.endpoints)
+            return
+        child = self.children.get(levels[i])
+        if child is not None:
+            child._match(levels, i + 1, out)
+        if self.plus is not None:
+            self.plus._match(levels, i + 1, out)
+
 
 class Command(BaseCommand):
     help = "MQTT worker: subscribe to topics and update Device readings."
@@ -32,156 +160,428 @@ class Command(BaseCommand):
 
         self.channel_layer = get_channel_layer()
 
+        # One long-lived event loop for all channel-layer sends. Using
+        # async_to_sync per broadcast would spin up (and tear down) an
+        # event loop for every message; run_coroutine_threadsafe against
+        # this loop amortizes that to zero.
+        self._broadcast_loop = asyncio.new_event_loop()
+        self._broadcast_thread = threading.Thread(
+            target=self._broadcast_loop.run_forever,
+            name="mqtt-broadcaster",
+            daemon=True,
+        )
+        self._broadcast_thread.start()
+
+        # Subscribed addresses compiled into a trie so the hot path is an
+        # O(levels) walk (with `+`/`#` wildcard support) instead of an ORM
+        # query per message. paho calls on_message from its network
+        # thread, so guard swaps with a lock.
+        self.topics = []
+        self.topic_trie = TopicTrie()
+        self.topic_map_lock = threading.Lock()
+        # topic → (scales, offsets) float64 arrays aligned with the trie
+        # match order; rebuilt lazily, dropped on every map refresh.
+        self._scaling_cache = {}
+        self._refresh_timer = None
+        self.refresh_topic_map()
+
+        # Writes are not performed on paho's network thread: on_message
+        # only parses and enqueues, and this worker drains the queue in
+        # time-windowed batches so broker backpressure is decoupled from
+        # ORM latency.
+        self.write_queue = queue.Queue(maxsize=WRITE_QUEUE_MAXSIZE)
+
+        # Latest pending update per device id; only ever touched from the
+        # drain thread, flushed at most every BROADCAST_FLUSH_SECONDS.
+        self._pending_broadcasts = {}
+        self._last_broadcast_at = 0.0
+        # device id → last broadcast value, for the deadband check
+        self._last_broadcast_values = {}
+        # device id → monotonic time last_value_raw was last persisted
+        self._last_raw_write = {}
+
+        self._drain_thread = threading.Thread(
+            target=self._drain_loop,
+            name="mqtt-db-writer",
+            daemon=True,
+        )
+        self._drain_thread.start()
+
         client = mqtt.Client(client_id="home_automation_django_worker")
         client.on_connect = self.on_connect
         client.on_message = self.on_message
 
         client.connect(MQTT_HOST, MQTT_PORT, keepalive=60)
-        client.loop_start()
 
         try:
-            while True:
-                time.sleep(1)
+            # Run paho's network loop inline: one fewer thread contending
+            # for the GIL, built-in reconnects, and Ctrl-C lands
+            # immediately instead of after a sleep tick.
+            client.loop_forever(retry_first_connection=True)
         except KeyboardInterrupt:
             self.stdout.write(self.style.WARNING("[mqtt-worker] stopping"))
         finally:
-            client.loop_stop()
+            if self._refresh_timer is not None:
+                self._refresh_timer.cancel()
+            self._broadcast_loop.call_soon_threadsafe(self._broadcast_loop.stop)
+            client.disconnect()
+
+    def refresh_topic_map(self):
+        """
+        (Re)build the topic trie from the DB and schedule the next
+        refresh. Runs at startup and then every
+        TOPIC_MAP_REFRESH_SECONDS so endpoint edits are picked up without
+        querying on every message.
+        """
+        try:
+            endpoints = DeviceEndpoint.objects.filter(
+                direction=DeviceEndpoint.Direction.INPUT,
+                connector__connector_type=Connector.ConnectorType.MQTT,
+            ).select_related("device", "device__room", "device__state")
+
+            topics = set()
+            trie = TopicTrie()
+            for ep in endpoints:
+                topics.add(ep.address)
+                trie.insert(ep.address, ep)
+
+            with self.topic_map_lock:
+                self.topics = sorted(topics)
+                self.topic_trie = trie
+                self._scaling_cache = {}
+        except Exception:
+            logger.exception("[mqtt-worker] Failed to refresh topic map")
+
+        self._refresh_timer = threading.Timer(
+            TOPIC_MAP_REFRESH_SECONDS, self.refresh_topic_map
+        )
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
 
     def on_connect(self, client, userdata, flags, rc):
         logger.info("[mqtt-worker] Connected to MQTT with code %s", rc)
 
         # Subscribe to all topics that have a DeviceEndpoint
-        topics = list(
-            DeviceEndpoint.objects.filter(
-                direction="input", connector__connector_type="mqtt"
-            )
-            .values_list("address", flat=True)
-            .distinct()
-        )
+        with self.topic_map_lock:
+            topics = list(self.topics)
 
         if not topics:
             logger.warning("[mqtt-worker] No MQTT DeviceEndpoints found")
             return
 
-        for t in topics:
-            client.subscribe(t, qos=0)
-            logger.info("[mqtt-worker] Subscribed to %s", t)
+        # The topic trie filters locally, so when all addresses share a
+        # common prefix one wildcard subscription covers them with a
+        # single broker-side entry. Otherwise subscribe with the list
+        # form: one SUBSCRIBE packet instead of one per topic.
+        prefix = _common_topic_prefix(topics) if len(topics) > 1 else ""
+        if prefix:
+            wildcard = f"{prefix}/#"
+            client.subscribe(wildcard, qos=0)
+            logger.info(
+                "[mqtt-worker] Subscribed to %s (covering %d topics)",
+                wildcard,
+                len(topics),
+            )
+        else:
+            client.subscribe([(t, 0) for t in topics])
+            logger.info("[mqtt-worker] Subscribed to %d topics", len(topics))
 
     def on_message(self, client, userdata, msg):
         topic = msg.topic
-        payload = msg.payload.decode("utf-8", errors="ignore")
 
-        logger.info("[mqtt-worker] Received on %s: %s", topic, payload)
+        # Find endpoints for this topic (cached; zero queries per message,
+        # wildcard-aware)
+        with self.topic_map_lock:
+            endpoints = self.topic_trie.match(topic)
 
-        # Find endpoints for this topic
-        endpoints = (
-            DeviceEndpoint.objects.filter(
-                direction="input",
-                connector__connector_type="mqtt",
-                address=topic,
-            )
-            .select_related("device")
-        )
-
-        if not endpoints.exists():
+        if not endpoints:
             logger.warning(
                 "[mqtt-worker] No DeviceEndpoint bound to topic %s", topic
             )
             return
 
+        # orjson parses the raw bytes directly; only decode to str for the
+        # last_value_raw column once we know the message is relevant.
         try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
+            data = orjson.loads(msg.payload)
+        except orjson.JSONDecodeError:
             logger.error(
-                "[mqtt-worker] invalid JSON for topic %s: %s", topic, payload
+                "[mqtt-worker] invalid JSON for topic %s: %r", topic, msg.payload
             )
             return
 
+        payload = msg.payload.decode("utf-8", errors="ignore")
+        logger.info("[mqtt-worker] Received on %s: %s", topic, payload)
+
         value = data.get("value")
         unit = data.get("unit")
 
-        for ep in endpoints:
-            device = ep.device
-            if value is not None and isinstance(value, (int, float)):
-                scaled = ep.scale * float(value) + ep.offset
-                device.last_value = scaled
-                device.last_value_raw = payload
-                device.last_updated_at = timezone.now()
+        if value is None or not isinstance(value, (int, float)):
+            return
 
-                if unit and not device.unit:
-                    device.unit = unit
-
-                device.save(
-                    update_fields=[
-                        "last_value",
-                        "last_value_raw",
-                        "last_updated_at",
-                        "unit",
-                    ]
-                )
+        # Hand off to the batching writer; never block the network thread.
+        # The batch timestamp is taken once per flush, not per message.
+        try:
+            self.write_queue.put_nowait(
+                (topic, endpoints, float(value), unit, payload)
+            )
+        except queue.Full:
+            logger.warning(
+                "[mqtt-worker] Write queue full; dropping message on %s", topic
+            )
 
-                logger.info(
-                    "[mqtt-worker] Updated Device %s (id=%s) from topic %s → %s %s",
-                    device.name,
-                    device.id,
-                    topic,
-                    scaled,
-                    device.unit or "",
+    def _drain_loop(self):
+        """
+        Background writer: pop parsed messages off the queue in windows of
+        up to FLUSH_WINDOW_SECONDS / FLUSH_MAX_MESSAGES and flush each
+        window with a single bulk UPDATE.
+        """
+        last_db_maintenance = time.monotonic()
+        while True:
+            # With CONN_MAX_AGE set, connections persist across flushes;
+            # periodically drop ones that went stale or unusable.
+            if time.monotonic() - last_db_maintenance >= DB_MAINTENANCE_SECONDS:
+                last_db_maintenance = time.monotonic()
+                for conn in connections.all(initialized_only=True):
+                    conn.close_if_unusable_or_obsolete()
+
+            try:
+                item = self.write_queue.get(timeout=BROADCAST_FLUSH_SECONDS)
+            except queue.Empty:
+                self._flush_broadcasts()
+                continue
+
+            batch = [item]
+            deadline = time.monotonic() + FLUSH_WINDOW_SECONDS
+            while len(batch) < FLUSH_MAX_MESSAGES:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._flush(batch)
+            except Exception:
+                logger.exception(
+                    "[mqtt-worker] Failed to flush batch of %d messages",
+                    len(batch),
                 )
 
-                # 🔴 NEW: broadcast update over Channels to WebSocket clients
-                self.broadcast_device_update(device)
+            self._flush_broadcasts()
+
+    def _flush(self, batch):
+        # Apply scaling in memory, coalescing repeated updates for the
+        # same device so the newest value wins, then persist everything
+        # in one statement instead of one UPDATE per endpoint.
+        # Tz-aware datetime construction is not free at thousands of
+        # messages/sec; one timestamp per flushed batch is plenty.
+        now = timezone.now()
+
+        devices = {}
+        units = {}
+        for topic, endpoints, value, unit, payload in batch:
+            # One vectorized scale*value+offset per topic instead of a
+            # Python-level multiply/add per endpoint.
+            scales, offsets = self._topic_scaling(topic, endpoints)
+            scaled = scales * value + offsets
+            for ep, scaled_value in zip(endpoints, scaled):
+                device = ep.device
+                # Plain attributes on the instance: the columns live on
+                # DeviceState and are persisted by _write_states below.
+                device.last_value = float(scaled_value)
+                device.last_value_raw = payload
+                device.last_updated_at = now
+                devices[device.pk] = device
+                if unit and not device.unit:
+                    units.setdefault(unit, set()).add(device.pk)
+
+        if not devices:
+            return
+
+        # Persist the raw payload only every RAW_WRITE_SECONDS per device;
+        # the fast path updates just the scaled value and timestamp.
+        mono = time.monotonic()
+        with_raw = []
+        without_raw = []
+        for pk, device in devices.items():
+            if mono - self._last_raw_write.get(pk, 0.0) >= RAW_WRITE_SECONDS:
+                self._last_raw_write[pk] = mono
+                with_raw.append(device)
+            else:
+                without_raw.append(device)
+
+        if with_raw:
+            self._write_states(with_raw, include_raw=True)
+        if without_raw:
+            self._write_states(without_raw, include_raw=False)
+
+        # Backfill missing units with one UPDATE per distinct unit.
+        for unit, pks in units.items():
+            Device.objects.filter(pk__in=pks).update(unit=unit)
+            for pk in pks:
+                devices[pk].unit = unit
+
+        for device in devices.values():
+            logger.info(
+                "[mqtt-worker] Updated Device %s (id=%s) → %s %s",
+                device.name,
+                device.id,
+                device.last_value,
+                device.unit or "",
+            )
+
+            # Deadband: sensors repeating (near-)identical values don't
+            # need to reach the channel layer at all.
+            last_broadcast = self._last_broadcast_values.get(device.id)
+            if (
+                BROADCAST_DEADBAND > 0
+                and last_broadcast is not None
+                and device.last_value is not None
+                and abs(device.last_value - last_broadcast) < BROADCAST_DEADBAND
+            ):
+                continue
+            self._last_broadcast_values[device.id] = device.last_value
+
+            # Stash for the paced broadcast flush; newer updates for the
+            # same device simply overwrite the pending entry.
+            self._pending_broadcasts[device.id] = device
+
+    def _write_states(self, devices, include_raw=True):
+        """
+        Persist a batch of readings to the DeviceState table in one
+        statement. The state rows are narrow and carry no secondary
+        indexes, so each tick rewrites a small tuple instead of the
+        whole device row plus its indexes.
+
+        On Postgres, use UPDATE ... FROM (VALUES ...) — it plans in O(1)
+        regardless of batch size, unlike bulk_update's generated
+        CASE WHEN chain (one branch per row per column). Other backends
+        fall back to bulk_update.
+        """
+        fields = ["last_value", "last_updated_at"]
+        if include_raw:
+            fields.append("last_value_raw")
+
+        connection = connections["default"]
+        if connection.vendor != "postgresql":
+            states = [
+                DeviceState(
+                    device_id=device.pk,
+                    last_value=device.last_value,
+                    last_value_raw=device.last_value_raw,
+                    last_updated_at=device.last_updated_at,
+                )
+                for device in devices
+            ]
+            DeviceState.objects.bulk_update(states, fields, batch_size=500)
+            return
 
-    def broadcast_device_update(self, device: Device) -> None:
+        table = DeviceState._meta.db_table
+        if include_raw:
+            row_sql = "(%s::bigint, %s::double precision, %s::timestamptz, %s::varchar)"
+            set_sql = (
+                "last_value = v.last_value, "
+                "last_updated_at = v.last_updated_at, "
+                "last_value_raw = v.last_value_raw"
+            )
+            columns = "v(id, last_value, last_updated_at, last_value_raw)"
+        else:
+            row_sql = "(%s::bigint, %s::double precision, %s::timestamptz)"
+            set_sql = "last_value = v.last_value, last_updated_at = v.last_updated_at"
+            columns = "v(id, last_value, last_updated_at)"
+
+        sql = (
+            f"UPDATE {table} AS s SET {set_sql} "
+            f"FROM (VALUES {', '.join([row_sql] * len(devices))}) AS {columns} "
+            "WHERE s.device_id = v.id"
+        )
+        params = []
+        for device in devices:
+            params += [device.pk, device.last_value, device.last_updated_at]
+            if include_raw:
+                params.append(device.last_value_raw)
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+
+    def _topic_scaling(self, topic, endpoints):
         """
-        Push a single device update to the room WebSocket group so
-        connected frontends receive it in real time.
+        Scale/offset arrays for a concrete topic, aligned with the order
+        the trie returns its endpoints in. Memoized until the next topic
+        map refresh.
+        """
+        with self.topic_map_lock:
+            cached = self._scaling_cache.get(topic)
+            if cached is None:
+                cached = (
+                    np.array([ep.scale for ep in endpoints], dtype=np.float64),
+                    np.array([ep.offset for ep in endpoints], dtype=np.float64),
+                )
+                self._scaling_cache[topic] = cached
+        return cached
 
-        Expects a Channels consumer listening on group name `room_<room_id>`
-        and handling an event type `device_update`.
+    def _flush_broadcasts(self):
         """
+        Serialize and publish pending device updates, at most once every
+        BROADCAST_FLUSH_SECONDS, so chatty sensors cannot flood the
+        channel layer with one broadcast per message.
+        """
+        if not self._pending_broadcasts:
+            return
+        now = time.monotonic()
+        if now - self._last_broadcast_at < BROADCAST_FLUSH_SECONDS:
+            return
+        self._last_broadcast_at = now
+
         if not self.channel_layer:
             logger.debug(
                 "[mqtt-worker] No channel_layer configured; "
-                "skipping WebSocket broadcast for device id=%s",
-                device.id,
+                "skipping WebSocket broadcasts",
             )
+            self._pending_broadcasts = {}
             return
 
-        if not getattr(device, "room_id", None):
-            logger.debug(
-                "[mqtt-worker] Device id=%s has no room; "
-                "skipping WebSocket broadcast",
-                device.id,
+        pending, self._pending_broadcasts = self._pending_broadcasts, {}
+
+        # One device_update per subscribed device group, plus one
+        # aggregated device_updates_batch per room so whole-room watchers
+        # get a single frame per flush instead of one per device.
+        sends = []
+        room_batches = {}
+        for device in pending.values():
+            if not getattr(device, "room_id", None):
+                continue
+            delta = _serialize_device_delta(device)
+            sends.append(
+                (f"device_{device.id}", {"type": "device_update", "device": delta})
             )
-            return
+            room_batches.setdefault(device.room_id, []).append(delta)
 
-        try:
-            serialized = DeviceSerializer(device).data
-        except Exception:
-            logger.exception(
-                "[mqtt-worker] Failed to serialize device id=%s for broadcast",
-                device.id,
+        for room_id, updates in room_batches.items():
+            sends.append(
+                (f"room_{room_id}", {"type": "device_updates_batch", "updates": updates})
             )
+
+        if not sends:
             return
 
-        group_name = f"room_{device.room_id}"
+        future = asyncio.run_coroutine_threadsafe(
+            self._send_events(sends), self._broadcast_loop
+        )
+        future.add_done_callback(self._log_broadcast_result)
 
-        try:
-            async_to_sync(self.channel_layer.group_send)(
-                group_name,
-                {
-                    "type": "device_update",  # maps to device_update() in your RoomConsumer
-                    "device": serialized,
-                },
-            )
-            logger.debug(
-                "[mqtt-worker] Broadcasted device update to group %s (device id=%s)",
-                group_name,
-                device.id,
-            )
-        except Exception:
-            logger.exception(
-                "[mqtt-worker] Failed to send device update to group %s",
-                group_name,
-            )
\ No newline at end of file
+    async def _send_events(self, sends):
+        # Issue all group_sends of this flush concurrently so their Redis
+        # round-trips overlap instead of serializing.
+        await asyncio.gather(
+            *(self.channel_layer.group_send(group, event) for group, event in sends)
+        )
+
+    @staticmethod
+    def _log_broadcast_result(future):
+        exc = future.exception()
+        if exc is not None:
+            logger.error("[mqtt-worker] Failed to send device update: %s", exc)
\ No newline at end of file
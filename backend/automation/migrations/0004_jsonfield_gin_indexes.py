@@ -0,0 +1,48 @@
+"""
+GIN indexes (jsonb_path_ops) for the JSONField columns, so containment
+filters like .filter(config__contains={"k": "v"}) — which the ORM emits
+as the @> operator — hit an index instead of a sequential scan.
+
+jsonb_path_ops is roughly half the size of the default jsonb_ops and
+serves @> lookups; key lookups (config__k="v") bypass it, so query code
+should prefer __contains for these columns.
+
+Guarded on the connection vendor: the sqlite dev database simply skips
+the indexes.
+"""
+from django.db import migrations
+
+GIN_INDEXES = [
+    ("automation_integration", "metadata", "integration_metadata_gin"),
+    ("automation_connector", "config", "connector_config_gin"),
+    ("automation_device", "config", "device_config_gin"),
+    ("automation_deviceendpoint", "metadata", "endpoint_metadata_gin"),
+]
+
+
+def add_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, column, name in GIN_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" '
+            f'USING gin ("{column}" jsonb_path_ops)'
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _table, _column, name in GIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("automation", "0003_device_decimal_places_device_device_kind_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_gin_indexes, drop_gin_indexes),
+    ]
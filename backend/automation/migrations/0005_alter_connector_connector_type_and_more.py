@@ -0,0 +1,94 @@
+# Generated by Django 5.0.6 on 2026-08-30 03:35
+#
+# Converts the choice CharFields to PositiveSmallIntegerField. The
+# RunPython step rewrites the slug strings to their numeric values while
+# the columns are still CHAR, then the AlterFields change the column
+# type (cast is lossless since every value is a digit string by then).
+
+from django.db import migrations, models
+
+# (model, field) -> slug -> int, mirroring the SlugChoices enums.
+CHOICE_MAPS = {
+    ("integration", "provider"): {
+        "google_home": 1, "nest": 2, "ring": 3, "other": 4,
+    },
+    ("connector", "connector_type"): {
+        "mqtt": 1, "plc_modbus": 2, "plc_opcua": 3,
+        "nest_api": 4, "http_api": 5, "other": 6,
+    },
+    ("device", "device_type"): {
+        "light": 1, "switch": 2, "camera": 3, "thermostat": 4, "sensor": 5,
+    },
+    ("device", "device_kind"): {
+        "sensor": 1, "actuator": 2, "hybrid": 3,
+    },
+    ("device", "signal_type"): {
+        "analog": 1, "digital": 2, "string": 3,
+    },
+    ("device", "integration"): {
+        "local": 1, "google_home": 2, "nest": 3, "ring": 4, "other": 5,
+    },
+    ("deviceendpoint", "direction"): {
+        "input": 1, "output": 2,
+    },
+}
+
+
+def slugs_to_ints(apps, schema_editor):
+    for (model_name, field), mapping in CHOICE_MAPS.items():
+        model = apps.get_model("automation", model_name)
+        for slug, value in mapping.items():
+            model.objects.filter(**{field: slug}).update(**{field: str(value)})
+
+
+def ints_to_slugs(apps, schema_editor):
+    for (model_name, field), mapping in CHOICE_MAPS.items():
+        model = apps.get_model("automation", model_name)
+        for slug, value in mapping.items():
+            model.objects.filter(**{field: str(value)}).update(**{field: slug})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0004_jsonfield_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(slugs_to_ints, ints_to_slugs),
+        migrations.AlterField(
+            model_name='connector',
+            name='connector_type',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'MQTT'), (2, 'PLC (Modbus/TCP)'), (3, 'PLC (OPC UA)'), (4, 'Nest API'), (5, 'HTTP API'), (6, 'Other')]),
+        ),
+        migrations.AlterField(
+            model_name='device',
+            name='device_kind',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Sensor'), (2, 'Actuator'), (3, 'Hybrid')], default=1, help_text='Whether this behaves as a sensor, actuator, or both.'),
+        ),
+        migrations.AlterField(
+            model_name='device',
+            name='device_type',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Light'), (2, 'Switch'), (3, 'Camera'), (4, 'Thermostat'), (5, 'Sensor')], help_text='Logical type of device, used for UI and behavior.'),
+        ),
+        migrations.AlterField(
+            model_name='device',
+            name='integration',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Local'), (2, 'Google Home'), (3, 'Nest'), (4, 'Ring'), (5, 'Other')], default=1, help_text='Which integration this device is conceptually backed by.'),
+        ),
+        migrations.AlterField(
+            model_name='device',
+            name='signal_type',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Analog'), (2, 'Digital'), (3, 'String')], default=1, help_text='Analog/digital/string – used for UI & validation.'),
+        ),
+        migrations.AlterField(
+            model_name='deviceendpoint',
+            name='direction',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Input (Sensor)'), (2, 'Output (Actuator)')], help_text='Input (read) or Output (write).'),
+        ),
+        migrations.AlterField(
+            model_name='integration',
+            name='provider',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Google Home'), (2, 'Nest'), (3, 'Ring'), (4, 'Other')]),
+        ),
+    ]
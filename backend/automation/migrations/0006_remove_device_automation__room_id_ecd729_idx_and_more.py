@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-08-30 03:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0005_alter_connector_connector_type_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='device',
+            name='automation__room_id_ecd729_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='room',
+            name='automation__owner_i_80afff_idx',
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-08-30 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0006_remove_device_automation__room_id_ecd729_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='connector',
+            name='config',
+            field=models.JSONField(blank=True, db_default={}, help_text='Arbitrary connector-specific configuration.'),
+        ),
+        migrations.AlterField(
+            model_name='device',
+            name='config',
+            field=models.JSONField(blank=True, db_default={}, help_text='Arbitrary device-specific configuration payload.'),
+        ),
+        migrations.AlterField(
+            model_name='deviceendpoint',
+            name='metadata',
+            field=models.JSONField(blank=True, db_default={}, help_text='Extra endpoint-specific configuration or flags.'),
+        ),
+        migrations.AlterField(
+            model_name='integration',
+            name='metadata',
+            field=models.JSONField(blank=True, db_default={}, help_text='Arbitrary provider-specific configuration or state.'),
+        ),
+    ]
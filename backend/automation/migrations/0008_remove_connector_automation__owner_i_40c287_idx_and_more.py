@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-08-30 03:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0007_alter_connector_config_alter_device_config_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='connector',
+            name='automation__owner_i_40c287_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='integration',
+            name='automation__owner_i_a8ee31_idx',
+        ),
+        migrations.AddIndex(
+            model_name='connector',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['owner'], name='connector_owner_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['room'], name='device_room_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='integration',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['owner'], name='integration_owner_active_idx'),
+        ),
+    ]
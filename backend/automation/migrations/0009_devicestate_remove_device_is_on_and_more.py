@@ -0,0 +1,78 @@
+# Generated by Django 5.0.6 on 2026-08-30 03:41
+#
+# Splits the hot telemetry columns off the Device row into DeviceState
+# (one narrow row per device, no secondary indexes). The RunPython step
+# copies the existing values across before the columns are dropped.
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_state_out(apps, schema_editor):
+    Device = apps.get_model("automation", "Device")
+    DeviceState = apps.get_model("automation", "DeviceState")
+    rows = Device.objects.values_list(
+        "id", "last_value", "last_value_raw", "last_updated_at", "is_on"
+    )
+    DeviceState.objects.bulk_create(
+        [
+            DeviceState(
+                device_id=pk,
+                last_value=last_value,
+                last_value_raw=last_value_raw or "",
+                last_updated_at=last_updated_at,
+                is_on=is_on,
+            )
+            for pk, last_value, last_value_raw, last_updated_at, is_on in rows
+        ],
+        batch_size=500,
+    )
+
+
+def copy_state_back(apps, schema_editor):
+    Device = apps.get_model("automation", "Device")
+    DeviceState = apps.get_model("automation", "DeviceState")
+    for state in DeviceState.objects.all().iterator():
+        Device.objects.filter(pk=state.device_id).update(
+            last_value=state.last_value,
+            last_value_raw=state.last_value_raw,
+            last_updated_at=state.last_updated_at,
+            is_on=state.is_on,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0008_remove_connector_automation__owner_i_40c287_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeviceState',
+            fields=[
+                ('device', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='state', serialize=False, to='automation.device')),
+                ('last_value', models.FloatField(blank=True, help_text='Last engineering value (after scaling).', null=True)),
+                ('last_value_raw', models.CharField(blank=True, help_text='Raw value as received (before scaling / parsing).', max_length=255)),
+                ('last_updated_at', models.DateTimeField(blank=True, help_text='When last_value was updated.', null=True)),
+                ('is_on', models.BooleanField(default=False, help_text='Logical on/off state of the device.')),
+            ],
+        ),
+        migrations.RunPython(copy_state_out, copy_state_back),
+        migrations.RemoveField(
+            model_name='device',
+            name='is_on',
+        ),
+        migrations.RemoveField(
+            model_name='device',
+            name='last_updated_at',
+        ),
+        migrations.RemoveField(
+            model_name='device',
+            name='last_value',
+        ),
+        migrations.RemoveField(
+            model_name='device',
+            name='last_value_raw',
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.6 on 2026-08-30 06:12
+#
+# Denormalizes room.owner onto Device so owner-scoped device queries
+# filter one indexed column instead of joining through Room. The column
+# is added nullable, backfilled from the room, then made required.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_owner(apps, schema_editor):
+    Room = apps.get_model("automation", "Room")
+    Device = apps.get_model("automation", "Device")
+    for room_id, owner_id in Room.objects.values_list("id", "owner_id"):
+        Device.objects.filter(room_id=room_id).update(owner_id=owner_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("automation", "0009_devicestate_remove_device_is_on_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="device",
+            name="owner",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="all_devices",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.RunPython(backfill_owner, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="device",
+            name="owner",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="all_devices",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="device",
+            index=models.Index(
+                fields=["owner", "room"], name="automation__owner_i_8be9cd_idx"
+            ),
+        ),
+    ]
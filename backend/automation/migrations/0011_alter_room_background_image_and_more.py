@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-08-30 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0010_device_owner'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='room',
+            name='background_image',
+            field=models.FileField(blank=True, help_text='Uploaded background image for this room.', null=True, upload_to='room_backgrounds/'),
+        ),
+        migrations.AlterField(
+            model_name='room',
+            name='background_image_url',
+            field=models.CharField(blank=True, help_text='Optional external URL for a background image. Prefer using the uploaded background_image field.', max_length=255),
+        ),
+    ]
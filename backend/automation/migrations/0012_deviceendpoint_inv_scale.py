@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-08-30 03:52
+
+from django.db import migrations, models
+
+
+def backfill_inv_scale(apps, schema_editor):
+    DeviceEndpoint = apps.get_model("automation", "DeviceEndpoint")
+    for endpoint in DeviceEndpoint.objects.exclude(scale__in=(0.0, 1.0)).only(
+        "id", "scale"
+    ):
+        DeviceEndpoint.objects.filter(pk=endpoint.pk).update(
+            inv_scale=1.0 / endpoint.scale
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0011_alter_room_background_image_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='deviceendpoint',
+            name='inv_scale',
+            field=models.FloatField(default=1.0, editable=False, help_text='Precomputed inverse of scale, kept in sync on save.'),
+        ),
+        migrations.RunPython(backfill_inv_scale, migrations.RunPython.noop),
+    ]
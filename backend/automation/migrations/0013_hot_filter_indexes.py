@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-08-30 03:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automation', '0012_deviceendpoint_inv_scale'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='deviceendpoint',
+            name='automation__device__d14b41_idx',
+        ),
+        migrations.AddIndex(
+            model_name='deviceendpoint',
+            index=models.Index(fields=['device', 'direction', 'is_primary'], name='automation__device__da11be_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['owner', 'name'], name='automation__owner_i_bac137_idx'),
+        ),
+    ]
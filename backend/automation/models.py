@@ -1,5 +1,33 @@
+from functools import cached_property
+
 from django.conf import settings
 from django.db import models
+from django.db.models import Q
+
+
+class SlugChoices(models.IntegerChoices):
+    """
+    IntegerChoices stored as small ints (cheap comparisons, ~10x smaller
+    index entries than the old CHAR columns) but addressed by the legacy
+    string slugs — lowercased member names — everywhere outside the
+    database: API payloads, worker filters, websocket snapshots.
+    """
+
+    @property
+    def slug(self):
+        return self.name.lower()
+
+    @classmethod
+    def from_slug(cls, slug):
+        try:
+            return cls[str(slug).upper()]
+        except KeyError:
+            raise ValueError(f"{slug!r} is not a valid {cls.__name__} slug")
+
+    @classmethod
+    def slug_map(cls):
+        """value → slug dict, for mapping projection (.values()) rows."""
+        return {member.value: member.slug for member in cls}
 
 
 class Room(models.Model):
@@ -11,16 +39,21 @@ class Room(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(max_length=120)
 
-    # Actual image field for uploaded backgrounds
-    background_image = models.ImageField(
+    # Actual image field for uploaded backgrounds. Stored as a plain
+    # FileField: the serializer checks the upload's content type, which
+    # skips ImageField's Pillow open-and-verify pass per upload.
+    background_image = models.FileField(
         upload_to="room_backgrounds/",
         blank=True,
         null=True,
         help_text="Uploaded background image for this room.",
     )
 
-    # Optional external URL for a background image (legacy / external)
-    background_image_url = models.URLField(
+    # Optional external URL for a background image (legacy / external).
+    # Plain CharField; URL syntax is the serializer's concern, not a
+    # per-assignment model check.
+    background_image_url = models.CharField(
+        max_length=255,
         blank=True,
         help_text=(
             "Optional external URL for a background image. "
@@ -45,19 +78,26 @@ class Room(models.Model):
     class Meta:
         unique_together = ("owner", "slug")
         ordering = ["name"]
+        # unique_together already builds a unique btree on (owner, slug);
+        # a second index on the same tuple only costs writes.
         indexes = [
-            models.Index(fields=["owner", "slug"]),
             models.Index(fields=["owner", "created_at"]),
+            # Serves the list view's filter-by-owner + order-by-name in
+            # one index scan.
+            models.Index(fields=["owner", "name"]),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.owner})"
 
-    @property
+    @cached_property
     def effective_background_url(self):
         """
         Prefer the uploaded image URL if present, otherwise fall back to
         background_image_url. The serializer can expose this as background_image_url.
+
+        Cached per instance: serializers may evaluate it several times per
+        request and the FieldFile attribute access is not free.
         """
         if self.background_image and hasattr(self.background_image, "url"):
             return self.background_image.url
@@ -69,19 +109,18 @@ class Integration(models.Model):
     High-level cloud/provider integration: Google Home, Nest, Ring, etc.
     These are good for OAuth, API keys, etc.
     """
-    PROVIDER_CHOICES = [
-        ("google_home", "Google Home"),
-        ("nest", "Nest"),
-        ("ring", "Ring"),
-        ("other", "Other"),
-    ]
+    class Provider(SlugChoices):
+        GOOGLE_HOME = 1, "Google Home"
+        NEST = 2, "Nest"
+        RING = 3, "Ring"
+        OTHER = 4, "Other"
 
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="integrations",
     )
-    provider = models.CharField(max_length=32, choices=PROVIDER_CHOICES)
+    provider = models.PositiveSmallIntegerField(choices=Provider.choices)
     display_name = models.CharField(max_length=100)
 
     access_token = models.CharField(
@@ -96,7 +135,7 @@ class Integration(models.Model):
     )
 
     metadata = models.JSONField(
-        default=dict,
+        db_default={},
         blank=True,
         help_text="Arbitrary provider-specific configuration or state.",
     )
@@ -118,7 +157,13 @@ class Integration(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["owner", "provider"]),
-            models.Index(fields=["owner", "is_active"]),
+            # Partial: soft-deleted rows are rare and never listed, so
+            # the index only carries active ones.
+            models.Index(
+                fields=["owner"],
+                name="integration_owner_active_idx",
+                condition=Q(is_active=True),
+            ),
         ]
 
     def __str__(self):
@@ -131,14 +176,13 @@ class Connector(models.Model):
     OPC UA server, or generic HTTP API. Integrations are business-level;
     Connectors are transport/protocol-level.
     """
-    CONNECTOR_TYPE_CHOICES = [
-        ("mqtt", "MQTT"),
-        ("plc_modbus", "PLC (Modbus/TCP)"),
-        ("plc_opcua", "PLC (OPC UA)"),
-        ("nest_api", "Nest API"),
-        ("http_api", "HTTP API"),
-        ("other", "Other"),
-    ]
+    class ConnectorType(SlugChoices):
+        MQTT = 1, "MQTT"
+        PLC_MODBUS = 2, "PLC (Modbus/TCP)"
+        PLC_OPCUA = 3, "PLC (OPC UA)"
+        NEST_API = 4, "Nest API"
+        HTTP_API = 5, "HTTP API"
+        OTHER = 6, "Other"
 
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -146,7 +190,7 @@ class Connector(models.Model):
         related_name="connectors",
     )
     name = models.CharField(max_length=100)
-    connector_type = models.CharField(max_length=32, choices=CONNECTOR_TYPE_CHOICES)
+    connector_type = models.PositiveSmallIntegerField(choices=ConnectorType.choices)
 
     # Optional link back to a higher-level Integration (e.g. Nest cloud)
     integration = models.ForeignKey(
@@ -175,7 +219,7 @@ class Connector(models.Model):
     )
 
     config = models.JSONField(
-        default=dict,
+        db_default={},
         blank=True,
         help_text="Arbitrary connector-specific configuration.",
     )
@@ -191,69 +235,75 @@ class Connector(models.Model):
         ordering = ["name"]
         indexes = [
             models.Index(fields=["owner", "connector_type"]),
-            models.Index(fields=["owner", "is_active"]),
+            models.Index(
+                fields=["owner"],
+                name="connector_owner_active_idx",
+                condition=Q(is_active=True),
+            ),
         ]
 
     def __str__(self):
-        return f"{self.name} ({self.connector_type})"
+        return f"{self.name} ({self.get_connector_type_display()})"
 
 
 class Device(models.Model):
-    DEVICE_TYPE_CHOICES = [
-        ("light", "Light"),
-        ("switch", "Switch"),
-        ("camera", "Camera"),
-        ("thermostat", "Thermostat"),
-        ("sensor", "Sensor"),
-    ]
-
-    INTEGRATION_CHOICES = [
-        ("local", "Local"),
-        ("google_home", "Google Home"),
-        ("nest", "Nest"),
-        ("ring", "Ring"),
-        ("other", "Other"),
-    ]
-
-    DEVICE_KIND_CHOICES = [
-        ("sensor", "Sensor"),
-        ("actuator", "Actuator"),
-        ("hybrid", "Hybrid"),  # e.g. thermostat (reading + setpoint)
-    ]
-
-    SIGNAL_TYPE_CHOICES = [
-        ("analog", "Analog"),
-        ("digital", "Digital"),
-        ("string", "String"),
-    ]
+    class DeviceType(SlugChoices):
+        LIGHT = 1, "Light"
+        SWITCH = 2, "Switch"
+        CAMERA = 3, "Camera"
+        THERMOSTAT = 4, "Thermostat"
+        SENSOR = 5, "Sensor"
+
+    class IntegrationKind(SlugChoices):
+        LOCAL = 1, "Local"
+        GOOGLE_HOME = 2, "Google Home"
+        NEST = 3, "Nest"
+        RING = 4, "Ring"
+        OTHER = 5, "Other"
+
+    class DeviceKind(SlugChoices):
+        SENSOR = 1, "Sensor"
+        ACTUATOR = 2, "Actuator"
+        HYBRID = 3, "Hybrid"  # e.g. thermostat (reading + setpoint)
+
+    class SignalType(SlugChoices):
+        ANALOG = 1, "Analog"
+        DIGITAL = 2, "Digital"
+        STRING = 3, "String"
 
     room = models.ForeignKey(
         Room,
         on_delete=models.CASCADE,
         related_name="devices",
     )
+    # Denormalized from room.owner (kept in sync by a pre_save signal)
+    # so "devices owned by X" filters hit one column instead of joining
+    # through Room on every request.
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="all_devices",
+        editable=False,
+    )
     name = models.CharField(max_length=100)
 
     # High-level type for UI iconography
-    device_type = models.CharField(
-        max_length=32,
-        choices=DEVICE_TYPE_CHOICES,
+    device_type = models.PositiveSmallIntegerField(
+        choices=DeviceType.choices,
         help_text="Logical type of device, used for UI and behavior.",
     )
 
     # Direction: sensor, actuator, or both
-    device_kind = models.CharField(
-        max_length=16,
-        choices=DEVICE_KIND_CHOICES,
-        default="sensor",
+    device_kind = models.PositiveSmallIntegerField(
+        choices=DeviceKind.choices,
+        default=DeviceKind.SENSOR,
         help_text="Whether this behaves as a sensor, actuator, or both.",
     )
 
     # Signal nature
-    signal_type = models.CharField(
-        max_length=16,
-        choices=SIGNAL_TYPE_CHOICES,
-        default="analog",
+    signal_type = models.PositiveSmallIntegerField(
+        choices=SignalType.choices,
+        default=SignalType.ANALOG,
         help_text="Analog/digital/string – used for UI & validation.",
     )
 
@@ -282,28 +332,10 @@ class Device(models.Model):
         help_text="If true, treat value as 0–100% and show accordingly.",
     )
 
-    # Last known measurement / state
-    last_value = models.FloatField(
-        blank=True,
-        null=True,
-        help_text="Last engineering value (after scaling).",
-    )
-    last_value_raw = models.CharField(
-        max_length=255,
-        blank=True,
-        help_text="Raw value as received (before scaling / parsing).",
-    )
-    last_updated_at = models.DateTimeField(
-        blank=True,
-        null=True,
-        help_text="When last_value was updated.",
-    )
-
     # High-level integration hint (matches your existing choices)
-    integration = models.CharField(
-        max_length=32,
-        choices=INTEGRATION_CHOICES,
-        default="local",
+    integration = models.PositiveSmallIntegerField(
+        choices=IntegrationKind.choices,
+        default=IntegrationKind.LOCAL,
         help_text="Which integration this device is conceptually backed by.",
     )
     external_id = models.CharField(
@@ -319,12 +351,6 @@ class Device(models.Model):
         help_text="Optional location label, e.g. 'Near window', 'Ceiling', etc.",
     )
 
-    # Logical on/off for actuators / binary sensors
-    is_on = models.BooleanField(
-        default=False,
-        help_text="Logical on/off state of the device.",
-    )
-
     # Canvas placement
     position_x = models.FloatField(
         default=10.0,
@@ -336,7 +362,7 @@ class Device(models.Model):
     )
 
     config = models.JSONField(
-        default=dict,
+        db_default={},
         blank=True,
         help_text="Arbitrary device-specific configuration payload.",
     )
@@ -350,16 +376,67 @@ class Device(models.Model):
 
     class Meta:
         ordering = ["room", "name"]
+        # (room, device_type) serves plain room lookups via its prefix,
+        # so no separate index on room alone.
         indexes = [
-            models.Index(fields=["room"]),
+            models.Index(fields=["owner", "room"]),
             models.Index(fields=["room", "device_type"]),
             models.Index(fields=["integration"]),
+            models.Index(
+                fields=["room"],
+                name="device_room_active_idx",
+                condition=Q(is_active=True),
+            ),
         ]
 
     def __str__(self):
         return f"{self.name} in {self.room}"
 
 
+class DeviceState(models.Model):
+    """
+    Hot per-device telemetry state, split out of Device.
+
+    These columns are rewritten on every telemetry tick while the rest of
+    the Device row is nearly immutable; keeping them in their own narrow
+    table means each tick rewrites a small tuple with no secondary
+    indexes to maintain, instead of the whole device row plus its
+    indexes. Rows are only ever reached via the device pk, so the table
+    deliberately carries no indexes beyond it. Every Device gets its
+    state row on creation (post_save signal / bulk paths).
+    """
+
+    device = models.OneToOneField(
+        Device,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="state",
+    )
+
+    last_value = models.FloatField(
+        blank=True,
+        null=True,
+        help_text="Last engineering value (after scaling).",
+    )
+    last_value_raw = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Raw value as received (before scaling / parsing).",
+    )
+    last_updated_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When last_value was updated.",
+    )
+    is_on = models.BooleanField(
+        default=False,
+        help_text="Logical on/off state of the device.",
+    )
+
+    def __str__(self):
+        return f"State of device {self.device_id}"
+
+
 class DeviceEndpoint(models.Model):
     """
     A generic connection point for a device to some external system
@@ -370,10 +447,9 @@ class DeviceEndpoint(models.Model):
     - Hybrids: typically 2 endpoints (one input, one output)
     """
 
-    ENDPOINT_DIRECTION_CHOICES = [
-        ("input", "Input (Sensor)"),
-        ("output", "Output (Actuator)"),
-    ]
+    class Direction(SlugChoices):
+        INPUT = 1, "Input (Sensor)"
+        OUTPUT = 2, "Output (Actuator)"
 
     device = models.ForeignKey(
         Device,
@@ -396,9 +472,8 @@ class DeviceEndpoint(models.Model):
         help_text="Optional link to the higher-level provider integration.",
     )
 
-    direction = models.CharField(
-        max_length=16,
-        choices=ENDPOINT_DIRECTION_CHOICES,
+    direction = models.PositiveSmallIntegerField(
+        choices=Direction.choices,
         help_text="Input (read) or Output (write).",
     )
 
@@ -417,6 +492,13 @@ class DeviceEndpoint(models.Model):
         default=0.0,
         help_text="Offset applied after scaling.",
     )
+    # Precomputed 1/scale (pre_save signal), so the engineering→raw
+    # conversion on actuator writes is a multiply with no zero check.
+    inv_scale = models.FloatField(
+        default=1.0,
+        editable=False,
+        help_text="Precomputed inverse of scale, kept in sync on save.",
+    )
 
     # For digital/boolean cases
     true_value = models.CharField(
@@ -436,7 +518,7 @@ class DeviceEndpoint(models.Model):
     )
 
     metadata = models.JSONField(
-        default=dict,
+        db_default={},
         blank=True,
         help_text="Extra endpoint-specific configuration or flags.",
     )
@@ -447,10 +529,12 @@ class DeviceEndpoint(models.Model):
     class Meta:
         ordering = ["device", "direction", "id"]
         indexes = [
-            models.Index(fields=["device"]),
+            # Covers plain per-device lookups via its prefix and the
+            # command path's output/primary resolution in full.
+            models.Index(fields=["device", "direction", "is_primary"]),
             models.Index(fields=["connector"]),
             models.Index(fields=["direction"]),
         ]
 
     def __str__(self):
-        return f"{self.device} [{self.direction}] @ {self.address}"
\ No newline at end of file
+        return f"{self.device} [{self.get_direction_display()}] @ {self.address}"
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Derive select_related / prefetch_related calls from a serializer's
+declared fields, so viewset querysets stay in sync with the serializers
+instead of hand-maintaining join lists that drift on every edit.
+
+Rules:
+  - a nested ModelSerializer on a FK       → select_related (SQL join)
+  - a many=True nested ModelSerializer     → prefetch_related (one IN query),
+    with the child queryset optimized recursively
+  - plain PK / write-only fields need no related rows and are skipped
+"""
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _relation_paths(serializer):
+    """
+    Collect (select_paths, prefetch_specs) for one serializer instance.
+
+    select_paths are "__"-joined relation chains; prefetch_specs are
+    (path, child_serializer_instance) pairs.
+    """
+    select = []
+    prefetch = []
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        source = (field.source or field.field_name).replace(".", "__")
+
+        if isinstance(field, serializers.ListSerializer):
+            child = field.child
+            if isinstance(child, serializers.ModelSerializer):
+                prefetch.append((source, child))
+        elif isinstance(field, serializers.ModelSerializer):
+            select.append(source)
+            nested_select, nested_prefetch = _relation_paths(field)
+            select += [f"{source}__{path}" for path in nested_select]
+            prefetch += [
+                (f"{source}__{path}", child) for path, child in nested_prefetch
+            ]
+    return select, prefetch
+
+
+def optimize_queryset(queryset, serializer_cls):
+    """
+    Apply the select_related/prefetch_related calls needed to serialize
+    `queryset` with `serializer_cls` in a constant number of queries.
+    """
+    select, prefetch = _relation_paths(serializer_cls())
+    if select:
+        queryset = queryset.select_related(*select)
+    for path, child in prefetch:
+        child_cls = type(child)
+        child_queryset = optimize_queryset(
+            child_cls.Meta.model.objects.all(), child_cls
+        )
+        queryset = queryset.prefetch_related(
+            Prefetch(path, queryset=child_queryset)
+        )
+    return queryset
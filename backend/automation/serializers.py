@@ -5,18 +5,100 @@ from rest_framework import serializers
 from .models import (
     Room,
     Device,
+    DeviceState,
     Integration,
     Connector,
     DeviceEndpoint,
 )
 
 
+class ChoiceSlugField(serializers.ChoiceField):
+    """
+    Speaks the legacy string slugs ("light", "mqtt", "input", ...) on the
+    wire while the model stores SlugChoices small ints, so the API shape
+    is unchanged by the integer-choices conversion.
+    """
+
+    def __init__(self, enum, **kwargs):
+        self.enum = enum
+        super().__init__(
+            choices=[(member.slug, member.label) for member in enum],
+            **kwargs,
+        )
+
+    def to_internal_value(self, data):
+        try:
+            return self.enum.from_slug(data)
+        except ValueError:
+            self.fail("invalid_choice", input=data)
+
+    def to_representation(self, value):
+        if value in ("", None):
+            return value
+        return self.enum(value).slug
+
+
+class OwnedPrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField for owner-scoped writes. Validation is
+    restricted to rows the requesting user owns and fetches only the pk
+    and ownership column instead of every column of the target, so a
+    foreign id fails with the usual "does not exist" error without extra
+    queries or I/O.
+    """
+
+    def __init__(self, owner_path="owner", **kwargs):
+        self.owner_path = owner_path
+        super().__init__(**kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get("request")
+        if request is not None and request.user.is_authenticated:
+            queryset = queryset.filter(**{self.owner_path: request.user})
+        return queryset
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "first_name", "last_name", "email"]
 
 
+class CachedOwnerMixin:
+    """
+    Serialize `owner` through a per-request cache. Every row in an
+    owner-scoped list belongs to the same user, so the user dict is
+    built once and reused instead of re-serialized N times.
+    """
+
+    def get_owner(self, obj):
+        cache = self.context.setdefault("_owner_cache", {})
+        data = cache.get(obj.owner_id)
+        if data is None:
+            request = self.context.get("request")
+            # The owner is almost always the requesting user, already in
+            # memory; fall back to the relation otherwise.
+            if request is not None and request.user.pk == obj.owner_id:
+                owner = request.user
+            else:
+                owner = obj.owner
+            data = cache[obj.owner_id] = UserSerializer(owner).data
+        return data
+
+
+class CommandSerializer(serializers.Serializer):
+    """
+    Payload for DeviceViewSet.command, validated once up front so the
+    command path works from typed values instead of poking at
+    request.data, and malformed payloads 400 before any endpoint work.
+    """
+
+    target_value = serializers.FloatField(required=False)
+    state = serializers.CharField(required=False)
+    is_on = serializers.BooleanField(required=False)
+
+
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
@@ -36,19 +118,22 @@ class LoginSerializer(serializers.Serializer):
 # Room / Integration
 # -------------------------------
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(CachedOwnerMixin, serializers.ModelSerializer):
     """
     Exposes:
       - background_image (write-only) for uploads
       - background_image_url (read-only) from effective_background_url
     """
-    background_image = serializers.ImageField(
+    # FileField + a content-type check instead of ImageField: DRF's
+    # ImageField verifies every upload through Pillow, which is the
+    # expensive part and adds nothing a content-type check doesn't.
+    background_image = serializers.FileField(
         write_only=True,
         required=False,
         allow_null=True,
     )
     background_image_url = serializers.SerializerMethodField(read_only=True)
-    owner = UserSerializer(read_only=True)
+    owner = serializers.SerializerMethodField()
 
     class Meta:
         model = Room
@@ -66,19 +151,56 @@ class RoomSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "owner", "created_at", "updated_at"]
 
+    def validate_background_image(self, value):
+        if value is not None:
+            content_type = getattr(value, "content_type", "")
+            if not content_type.startswith("image/"):
+                raise serializers.ValidationError("Upload must be an image.")
+        return value
+
     def get_background_image_url(self, obj):
-        request = self.context.get("request")
         url = obj.effective_background_url
         if not url:
             return None
-        # If it's a relative URL, build absolute
-        if request is not None and not url.startswith("http"):
-            return request.build_absolute_uri(url)
-        return url
+        if url.startswith("http"):
+            return url
+        # If it's a relative URL, build absolute. build_absolute_uri is
+        # called once per request; rows share the cached prefix.
+        request = self.context.get("request")
+        if request is None:
+            return url
+        prefix = self.context.get("_abs_prefix")
+        if prefix is None:
+            prefix = self.context["_abs_prefix"] = request.build_absolute_uri("/")
+        return prefix + url.lstrip("/")
 
 
-class IntegrationSerializer(serializers.ModelSerializer):
-    owner = UserSerializer(read_only=True)
+class IntegrationListSerializer(CachedOwnerMixin, serializers.ModelSerializer):
+    """
+    Slim variant for list views: no tokens and no metadata JSON, which
+    the dashboards never render and which dominate the row size.
+    """
+    owner = serializers.SerializerMethodField()
+    provider = ChoiceSlugField(Integration.Provider, read_only=True)
+
+    class Meta:
+        model = Integration
+        fields = [
+            "id",
+            "owner",
+            "provider",
+            "display_name",
+            "is_active",
+            "last_synced_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [f for f in fields if f != "provider"]
+
+
+class IntegrationSerializer(CachedOwnerMixin, serializers.ModelSerializer):
+    owner = serializers.SerializerMethodField()
+    provider = ChoiceSlugField(Integration.Provider)
 
     class Meta:
         model = Integration
@@ -108,12 +230,42 @@ class IntegrationSerializer(serializers.ModelSerializer):
 # Connector / DeviceEndpoint
 # -------------------------------
 
-class ConnectorSerializer(serializers.ModelSerializer):
-    owner = UserSerializer(read_only=True)
+class ConnectorListSerializer(CachedOwnerMixin, serializers.ModelSerializer):
+    """
+    Slim variant for list views: omits the config JSON blob (and the
+    write-only password never leaves the API anyway).
+    """
+    owner = serializers.SerializerMethodField()
+    integration = IntegrationListSerializer(read_only=True)
+    connector_type = ChoiceSlugField(Connector.ConnectorType, read_only=True)
+
+    class Meta:
+        model = Connector
+        fields = [
+            "id",
+            "owner",
+            "name",
+            "connector_type",
+            "integration",
+            "host",
+            "port",
+            "username",
+            "base_topic",
+            "base_path",
+            "is_active",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [f for f in fields if f != "connector_type"]
+
+
+class ConnectorSerializer(CachedOwnerMixin, serializers.ModelSerializer):
+    owner = serializers.SerializerMethodField()
     integration = IntegrationSerializer(read_only=True)
-    integration_id = serializers.PrimaryKeyRelatedField(
+    connector_type = ChoiceSlugField(Connector.ConnectorType)
+    integration_id = OwnedPrimaryKeyField(
         source="integration",
-        queryset=Integration.objects.all(),
+        queryset=Integration.objects.only("id", "owner_id"),
         write_only=True,
         required=False,
         allow_null=True,
@@ -146,17 +298,21 @@ class ConnectorSerializer(serializers.ModelSerializer):
 
 
 class DeviceEndpointSerializer(serializers.ModelSerializer):
+    direction = ChoiceSlugField(DeviceEndpoint.Direction)
+    device = OwnedPrimaryKeyField(
+        queryset=Device.objects.only("id", "owner_id"),
+    )
     connector = ConnectorSerializer(read_only=True)
-    connector_id = serializers.PrimaryKeyRelatedField(
+    connector_id = OwnedPrimaryKeyField(
         source="connector",
-        queryset=Connector.objects.all(),
+        queryset=Connector.objects.only("id", "owner_id"),
         write_only=True,
     )
 
     integration = IntegrationSerializer(read_only=True)
-    integration_id = serializers.PrimaryKeyRelatedField(
+    integration_id = OwnedPrimaryKeyField(
         source="integration",
-        queryset=Integration.objects.all(),
+        queryset=Integration.objects.only("id", "owner_id"),
         write_only=True,
         required=False,
         allow_null=True,
@@ -189,6 +345,63 @@ class DeviceEndpointSerializer(serializers.ModelSerializer):
 # Device
 # -------------------------------
 
+class DeviceListSerializer(serializers.ModelSerializer):
+    """
+    Slim variant for list views: flat columns only — no nested room, no
+    endpoints, no config JSON and no raw payload. The room page merges
+    live updates into exactly this shape.
+    """
+    device_type = ChoiceSlugField(Device.DeviceType, read_only=True)
+    device_kind = ChoiceSlugField(Device.DeviceKind, read_only=True)
+    signal_type = ChoiceSlugField(Device.SignalType, read_only=True)
+    integration = ChoiceSlugField(Device.IntegrationKind, read_only=True)
+    # Hot state lives on the DeviceState row; the API shape stays flat.
+    last_value = serializers.FloatField(source="state.last_value", read_only=True)
+    last_updated_at = serializers.DateTimeField(
+        source="state.last_updated_at", read_only=True
+    )
+    is_on = serializers.BooleanField(source="state.is_on", read_only=True)
+
+    class Meta:
+        model = Device
+        fields = [
+            "id",
+            "room",
+            "name",
+            "device_type",
+            "device_kind",
+            "signal_type",
+            "unit",
+            "min_value",
+            "max_value",
+            "decimal_places",
+            "is_percentage",
+            "last_value",
+            "last_updated_at",
+            "integration",
+            "external_id",
+            "location",
+            "is_on",
+            "position_x",
+            "position_y",
+            "is_active",
+        ]
+        read_only_fields = [
+            f
+            for f in fields
+            if f
+            not in (
+                "device_type",
+                "device_kind",
+                "signal_type",
+                "integration",
+                "last_value",
+                "last_updated_at",
+                "is_on",
+            )
+        ]
+
+
 class DeviceSerializer(serializers.ModelSerializer):
     """
     Rich device serializer exposing:
@@ -196,10 +409,24 @@ class DeviceSerializer(serializers.ModelSerializer):
       - last_value & last_updated_at
       - endpoints (for bindings to MQTT/PLC/etc.)
     """
+    device_type = ChoiceSlugField(Device.DeviceType)
+    device_kind = ChoiceSlugField(Device.DeviceKind, required=False)
+    signal_type = ChoiceSlugField(Device.SignalType, required=False)
+    integration = ChoiceSlugField(Device.IntegrationKind, required=False)
+    # Hot state lives on the DeviceState row; the API shape stays flat.
+    # is_on remains writable, routed to the state row in create/update.
+    last_value = serializers.FloatField(source="state.last_value", read_only=True)
+    last_value_raw = serializers.CharField(
+        source="state.last_value_raw", read_only=True
+    )
+    last_updated_at = serializers.DateTimeField(
+        source="state.last_updated_at", read_only=True
+    )
+    is_on = serializers.BooleanField(source="state.is_on", required=False)
     room = RoomSerializer(read_only=True)
-    room_id = serializers.PrimaryKeyRelatedField(
+    room_id = OwnedPrimaryKeyField(
         source="room",
-        queryset=Room.objects.all(),
+        queryset=Room.objects.only("id", "owner_id"),
         write_only=True,
     )
 
@@ -238,10 +465,29 @@ class DeviceSerializer(serializers.ModelSerializer):
         read_only_fields = [
             "id",
             "room",
-            "last_value",
-            "last_value_raw",
-            "last_updated_at",
             "created_at",
             "updated_at",
             "endpoints",
-        ]
\ No newline at end of file
+        ]
+
+    def create(self, validated_data):
+        state_data = validated_data.pop("state", None)
+        device = super().create(validated_data)
+        if state_data:
+            # The post_save signal just created the state row and cached
+            # the defaults on device.state; patch the cached instance
+            # after the UPDATE so the response echoes what was written.
+            DeviceState.objects.filter(pk=device.pk).update(**state_data)
+            for field, value in state_data.items():
+                setattr(device.state, field, value)
+        return device
+
+    def update(self, instance, validated_data):
+        state_data = validated_data.pop("state", None)
+        device = super().update(instance, validated_data)
+        if state_data:
+            state, _ = DeviceState.objects.update_or_create(
+                device=device, defaults=state_data
+            )
+            device.state = state
+        return device
\ No newline at end of file
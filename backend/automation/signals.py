@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Device, DeviceEndpoint, DeviceState, Room
+
+
+@receiver(pre_save, sender=Room)
+def stash_previous_room_owner(sender, instance, **kwargs):
+    """
+    Remember the stored owner before a room save so the post_save
+    handler below can tell a transfer from any other edit.
+    """
+    if instance.pk:
+        instance._previous_owner_id = (
+            Room.objects.values_list("owner_id", flat=True)
+            .filter(pk=instance.pk)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Room)
+def sync_device_owners_on_transfer(sender, instance, created, **kwargs):
+    """
+    Keep the denormalized Device.owner column in sync when a room is
+    transferred (the admin leaves Room.owner editable). Device saves
+    copy the owner from the room, but that never runs for devices the
+    room already has — one bulk UPDATE here covers them.
+    """
+    if created:
+        return
+    previous = getattr(instance, "_previous_owner_id", None)
+    if previous is not None and previous != instance.owner_id:
+        instance.devices.update(owner_id=instance.owner_id)
+
+
+@receiver(pre_save, sender=Device)
+def set_device_owner(sender, instance, **kwargs):
+    """
+    Keep the denormalized owner column in sync with the room. The room
+    object is already in memory on every serializer write, so this is a
+    plain attribute copy, not a query. bulk_create paths skip signals
+    and set owner_id themselves.
+    """
+    if instance.room_id is not None:
+        instance.owner_id = instance.room.owner_id
+
+
+@receiver(post_save, sender=Device)
+def create_device_state(sender, instance, created, **kwargs):
+    """
+    Every device gets its DeviceState row the moment it exists, so the
+    rest of the code can assume the state relation is always there.
+    bulk_create paths skip signals and create their state rows directly.
+    """
+    if created:
+        DeviceState.objects.get_or_create(device=instance)
+
+
+@receiver(pre_save, sender=DeviceEndpoint)
+def set_endpoint_inv_scale(sender, instance, **kwargs):
+    """
+    Keep the precomputed inverse scale in sync. A zero/None scale falls
+    back to 1.0, matching the old `scale or 1.0` behaviour in the
+    command path. bulk_create paths skip signals and set it themselves.
+    """
+    instance.inv_scale = 1.0 / instance.scale if instance.scale else 1.0
+
+
+@receiver(post_save, sender=DeviceEndpoint)
+@receiver(post_delete, sender=DeviceEndpoint)
+def clear_dispatch_specs(sender, **kwargs):
+    """
+    Uvicorn runs several worker processes and a local cache_clear() only
+    reaches the one that handled the edit, so bump the shared version
+    key — it is part of the lru key, which invalidates every worker's
+    entries. The local clear just frees the dead entries early.
+    """
+    from .views import DISPATCH_SPEC_VERSION_KEY, _dispatch_spec
+
+    try:
+        cache.incr(DISPATCH_SPEC_VERSION_KEY)
+    except ValueError:
+        cache.set(DISPATCH_SPEC_VERSION_KEY, 1, None)
+    _dispatch_spec.cache_clear()
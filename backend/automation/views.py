@@ -1,7 +1,14 @@
 import logging
+from collections import namedtuple
+from functools import lru_cache
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
 from django.utils import timezone
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from rest_framework import viewsets, permissions, status
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import api_view, permission_classes, action
@@ -11,22 +18,113 @@ from rest_framework.response import Response
 from .models import (
     Room,
     Device,
+    DeviceState,
     Integration,
     Connector,
     DeviceEndpoint,
 )
+from .authentication import token_cache_key
+from .dispatch import QueueFull, enqueue_write
+from .optimizations import optimize_queryset
 from .serializers import (
     UserSerializer,
     LoginSerializer,
     RoomSerializer,
     DeviceSerializer,
+    DeviceListSerializer,
     IntegrationSerializer,
+    IntegrationListSerializer,
     ConnectorSerializer,
+    ConnectorListSerializer,
     DeviceEndpointSerializer,
+    CommandSerializer,
 )
 
 logger = logging.getLogger(__name__)
 
+LIST_CACHE_SECONDS = 300
+
+# Flat projection for the device list; same wire shape as
+# DeviceListSerializer but built from .values() dicts — no model
+# instances, descriptors or serializer fields per row.
+DEVICE_LIST_COLUMNS = (
+    "id",
+    "room",
+    "name",
+    "device_type",
+    "device_kind",
+    "signal_type",
+    "unit",
+    "min_value",
+    "max_value",
+    "decimal_places",
+    "is_percentage",
+    "integration",
+    "external_id",
+    "location",
+    "position_x",
+    "position_y",
+    "is_active",
+)
+
+DEVICE_LIST_SLUGS = {
+    "device_type": Device.DeviceType.slug_map(),
+    "device_kind": Device.DeviceKind.slug_map(),
+    "signal_type": Device.SignalType.slug_map(),
+    "integration": Device.IntegrationKind.slug_map(),
+}
+
+
+def _cache_stamp(value):
+    """Render an aggregate timestamp for use inside a cache key."""
+    return value.isoformat() if value else "empty"
+
+
+# Dispatch constants for one output endpoint, resolved once: the raw
+# true/false strings with their fallbacks applied, the write address and
+# the precomputed conversion factors.
+DispatchSpec = namedtuple(
+    "DispatchSpec",
+    ["connector_id", "address", "true_raw", "false_raw", "offset", "inv_scale"],
+)
+
+
+# Shared invalidation for the per-process spec cache below. Endpoint
+# saves/deletes bump this counter in Redis (signals.py); the counter is
+# part of the lru key, so every worker process — not just the one that
+# handled the edit — falls through to the database on its next command.
+DISPATCH_SPEC_VERSION_KEY = "dispatch-spec:version"
+
+
+def dispatch_spec(endpoint_id):
+    return _dispatch_spec(endpoint_id, cache.get(DISPATCH_SPEC_VERSION_KEY, 0))
+
+
+@lru_cache(maxsize=4096)
+def _dispatch_spec(endpoint_id, version):
+    """
+    Per-process cache of DispatchSpec keyed on (endpoint id, shared
+    version), so repeated commands to the same actuator skip the
+    attribute derefs and `or` fallbacks at the cost of one Redis GET.
+    """
+    endpoint = DeviceEndpoint.objects.only(
+        "id",
+        "connector_id",
+        "address",
+        "true_value",
+        "false_value",
+        "offset",
+        "inv_scale",
+    ).get(pk=endpoint_id)
+    return DispatchSpec(
+        connector_id=endpoint.connector_id,
+        address=endpoint.address,
+        true_raw=endpoint.true_value or "1",
+        false_raw=endpoint.false_value or "0",
+        offset=endpoint.offset or 0.0,
+        inv_scale=endpoint.inv_scale,
+    )
+
 
 # --------------------------------------------------------------------
 # Auth endpoints
@@ -73,6 +171,9 @@ def login(request):
 def logout(request):
     try:
         token = Token.objects.get(user=request.user)
+        # Drop the auth cache entry first so the token stops working the
+        # moment it is gone, not when the cache entry expires.
+        cache.delete(token_cache_key(token.key))
         token.delete()
         logger.info("User logged out: %s", request.user.username)
     except Token.DoesNotExist:
@@ -97,32 +198,46 @@ class IsOwner(permissions.BasePermission):
     """
     Generic "owner" permission for this app.
 
-    - For models with `owner` field, we compare against request.user.
-    - For Device / DeviceEndpoint, we go via room/device to find the owner.
+    - Models with an `owner` FK (including Device, which carries a
+      denormalized copy) are checked by comparing owner_id — an integer
+      already on the row, no related-object fetch.
+    - DeviceEndpoint is checked through its device; the lookup is
+      memoized on the request since permission classes can evaluate the
+      same object more than once per request.
     """
 
     def has_permission(self, request, view):
         return bool(request.user and request.user.is_authenticated)
 
     def has_object_permission(self, request, view, obj):
-        user = request.user
-        owner = getattr(obj, "owner", None)
-
-        # Device → Room → owner
-        if owner is None and hasattr(obj, "room"):
-            owner = obj.room.owner
-
-        # DeviceEndpoint → Device → Room → owner
-        if owner is None and hasattr(obj, "device"):
-            try:
-                owner = obj.device.room.owner
-            except AttributeError:
-                pass
-
-        # Connector has owner as well
-        # (handled by the generic getattr above)
+        user_pk = request.user.pk
+
+        owner_id = getattr(obj, "owner_id", None)
+        if owner_id is not None:
+            return owner_id == user_pk
+
+        # DeviceEndpoint → Device.owner_id
+        device_id = getattr(obj, "device_id", None)
+        if device_id is not None:
+            # select_related("device") querysets have the device in
+            # memory already; compare without touching the cache.
+            device = obj._state.fields_cache.get("device")
+            if device is not None:
+                return device.owner_id == user_pk
+
+            owner_cache = getattr(request, "_owner_cache", None)
+            if owner_cache is None:
+                owner_cache = request._owner_cache = {}
+            key = ("device", device_id)
+            if key not in owner_cache:
+                owner_cache[key] = (
+                    Device.objects.values_list("owner_id", flat=True)
+                    .filter(pk=device_id)
+                    .first()
+                )
+            return owner_cache[key] == user_pk
 
-        return owner == user
+        return False
 
 
 # --------------------------------------------------------------------
@@ -144,23 +259,46 @@ class RoomViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
     def get_queryset(self):
-        return Room.objects.filter(owner=self.request.user).order_by("name")
+        return optimize_queryset(
+            Room.objects.filter(owner=self.request.user),
+            self.get_serializer_class(),
+        ).order_by("name")
+
+    def list(self, request, *args, **kwargs):
+        # Keyed on the max updated_at plus the row count: edits move the
+        # timestamp and deletes shrink the count, so either kind of
+        # change moves the key and the stale entry just expires;
+        # repeated GETs between writes are served straight from Redis.
+        stamps = Room.objects.filter(owner=request.user).aggregate(
+            latest=Max("updated_at"), total=Count("id")
+        )
+        key = (
+            f"rooms:{request.user.pk}:"
+            f"{_cache_stamp(stamps['latest'])}:{stamps['total']}"
+        )
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, LIST_CACHE_SECONDS)
+        return Response(data)
 
     def perform_create(self, serializer):
         room = serializer.save(owner=self.request.user)
-        logger.info(
-            "Room created: %s (user=%s)",
-            room.name,
-            self.request.user.username,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Room created: %s (user=%s)",
+                room.name,
+                self.request.user.username,
+            )
 
     def perform_update(self, serializer):
         room = serializer.save()
-        logger.info(
-            "Room updated: %s (user=%s)",
-            room.name,
-            self.request.user.username,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Room updated: %s (user=%s)",
+                room.name,
+                self.request.user.username,
+            )
 
 
 # --------------------------------------------------------------------
@@ -178,39 +316,147 @@ class DeviceViewSet(viewsets.ModelViewSet):
     serializer_class = DeviceSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return DeviceListSerializer
+        return DeviceSerializer
+
     def get_queryset(self):
-        return Device.objects.filter(room__owner=self.request.user).select_related(
-            "room"
+        # DeviceSerializer nests room (with owner) and endpoints (with
+        # connector → integration → owner); the joins/prefetches are
+        # derived from the serializer so they cannot drift from it.
+        queryset = optimize_queryset(
+            Device.objects.filter(owner=self.request.user),
+            self.get_serializer_class(),
+        ).select_related("state")  # hot state rows; dotted sources, so
+        # the serializer-derived joins don't know about them
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        # Keyed on both edit and telemetry timestamps plus the row count
+        # (deletes don't touch either max) so a stale value never
+        # sticks; live updates stream over the websocket anyway.
+        stamps = Device.objects.filter(owner=request.user).aggregate(
+            edited=Max("updated_at"),
+            reported=Max("state__last_updated_at"),
+            total=Count("id"),
         )
+        key = (
+            f"devices:{request.user.pk}:"
+            f"{_cache_stamp(stamps['edited'])}:{_cache_stamp(stamps['reported'])}:"
+            f"{stamps['total']}"
+        )
+        data = cache.get(key)
+        if data is None:
+            # Projection straight to dicts: no Device instances and no
+            # serializer machinery per row, just the slug mapping the
+            # frontend expects for the choice columns.
+            data = list(
+                Device.objects.filter(owner=request.user).values(
+                    *DEVICE_LIST_COLUMNS,
+                    last_value=F("state__last_value"),
+                    last_updated_at=F("state__last_updated_at"),
+                    is_on=F("state__is_on"),
+                )
+            )
+            for row in data:
+                for field, slugs in DEVICE_LIST_SLUGS.items():
+                    row[field] = slugs.get(row[field], row[field])
+            cache.set(key, data, LIST_CACHE_SECONDS)
+        return Response(data)
 
     def perform_create(self, serializer):
         room = serializer.validated_data["room"]
-        if room.owner != self.request.user:
+        if room.owner_id != self.request.user.pk:
             logger.warning(
-                "User %s tried to create device in room owned by %s",
+                "User %s tried to create device in room %s they do not own",
                 self.request.user.username,
-                room.owner.username,
+                room.pk,
             )
             raise permissions.PermissionDenied("You do not own this room")
         device = serializer.save()
-        logger.info(
-            "Device created: %s (type=%s, kind=%s, room=%s, user=%s)",
-            device.name,
-            device.device_type,
-            device.device_kind,
-            room.name,
-            self.request.user.username,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            # room.name is deferred on the validated room; log the id.
+            logger.info(
+                "Device created: %s (type=%s, kind=%s, room=%s, user=%s)",
+                device.name,
+                device.device_type,
+                device.device_kind,
+                device.room_id,
+                self.request.user.username,
+            )
 
     def perform_update(self, serializer):
         device = serializer.save()
+        if logger.isEnabledFor(logging.INFO):
+            # room_id, not room.name: the name would lazy-load the room
+            # when the instance came in without its join.
+            logger.info(
+                "Device updated: %s (type=%s, kind=%s, room=%s, user=%s)",
+                device.name,
+                device.device_type,
+                device.device_kind,
+                device.room_id,
+                self.request.user.username,
+            )
+
+    @action(detail=False, methods=["POST"])
+    def bulk(self, request):
+        """
+        Create many devices in one request.
+
+        Payload is a JSON list of device objects (same shape as a single
+        POST). All rows are validated up front, then inserted with
+        bulk_create in batches of 500 — one multi-row INSERT per batch
+        instead of a round-trip per device.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        for item in serializer.validated_data:
+            room = item["room"]
+            if room.owner_id != request.user.pk:
+                logger.warning(
+                    "User %s tried to bulk-create devices in room owned by %s",
+                    request.user.username,
+                    room.owner.username,
+                )
+                raise permissions.PermissionDenied("You do not own this room")
+
+        # bulk_create skips signals, so create the state rows here too
+        # and attach them for the response serialization.
+        state_datas = [
+            item.pop("state", None) or {} for item in serializer.validated_data
+        ]
+        with transaction.atomic():
+            devices = Device.objects.bulk_create(
+                # bulk_create also skips the pre_save owner sync; every
+                # room was just checked to belong to the requester.
+                [
+                    Device(owner_id=request.user.pk, **item)
+                    for item in serializer.validated_data
+                ],
+                batch_size=500,
+            )
+            states = DeviceState.objects.bulk_create(
+                [
+                    DeviceState(device=device, **state_data)
+                    for device, state_data in zip(devices, state_datas)
+                ],
+                batch_size=500,
+            )
+        for device, state in zip(devices, states):
+            device.state = state
         logger.info(
-            "Device updated: %s (type=%s, kind=%s, room=%s, user=%s)",
-            device.name,
-            device.device_type,
-            device.device_kind,
-            device.room.name,
-            self.request.user.username,
+            "Devices bulk-created: count=%s, user=%s",
+            len(devices),
+            request.user.username,
+        )
+        # Flat serializer: echoing nested endpoints back would cost one
+        # query per freshly created (endpoint-less) device.
+        return Response(
+            DeviceListSerializer(devices, many=True).data,
+            status=status.HTTP_201_CREATED,
         )
 
     @action(detail=True, methods=["POST"])
@@ -242,30 +488,31 @@ class DeviceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = request.data or {}
+        payload = CommandSerializer(data=request.data or {})
+        payload.is_valid(raise_exception=True)
+        data = payload.validated_data
+
         signal_type = device.signal_type
+        spec = dispatch_spec(endpoint.pk)
 
         # 1) Determine desired engineering value / state
-        target_value = data.get("target_value", None)
-        state = data.get("state", None)
-        is_on = data.get("is_on", None)
+        target_value = data.get("target_value")
+        state = data.get("state")
+        is_on = data.get("is_on")
 
         # Normalize digital state
-        if signal_type == "digital":
+        if signal_type == Device.SignalType.DIGITAL:
             # prefer explicit "state"
             if state is not None:
-                state_str = str(state).lower()
-                desired_on = state_str in ("on", "true", "1", "yes")
+                desired_on = state.lower() in ("on", "true", "1", "yes")
             elif is_on is not None:
                 desired_on = bool(is_on)
             else:
                 # If nothing passed, toggle
-                desired_on = not device.is_on
+                desired_on = not device.state.is_on
 
             # Choose raw value
-            true_val = endpoint.true_value or "1"
-            false_val = endpoint.false_value or "0"
-            raw_value = true_val if desired_on else false_val
+            raw_value = spec.true_raw if desired_on else spec.false_raw
 
             # For logging / UI
             engineering_value = 1.0 if desired_on else 0.0
@@ -277,59 +524,88 @@ class DeviceViewSet(viewsets.ModelViewSet):
                     {"detail": "target_value is required for non-digital devices."},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            try:
-                eng_val = float(target_value)
-            except (TypeError, ValueError):
-                return Response(
-                    {"detail": "target_value must be numeric."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            # The serializer already coerced target_value to a float.
+            eng_val = target_value
 
             engineering_value = eng_val
-            # Raw = inverse of scale/offset
-            scale = endpoint.scale or 1.0
-            offset = endpoint.offset or 0.0
-            raw_value = (eng_val - offset) / scale if scale != 0 else eng_val
+            # Raw = inverse of scale/offset; inv_scale is precomputed on
+            # the endpoint row, so this is a multiply with no zero check.
+            raw_value = (eng_val - spec.offset) * spec.inv_scale
+
+        # 2) Hand the write to the in-process connector queue; the
+        # daemon writer thread does the broker I/O, so the request only
+        # pays for the enqueue. A full queue means the writer is not
+        # keeping up — surface that instead of buffering unboundedly.
+        try:
+            enqueue_write(spec.connector_id, spec.address, raw_value)
+        except QueueFull:
+            logger.warning(
+                "Connector write queue full; rejecting command for device %s",
+                device.id,
+            )
+            return Response(
+                {"detail": "Connector write queue is full, try again."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
 
-        # 2) Here is where you'd enqueue the actual write to connector
-        # For now we just log what we *would* do.
-        logger.info(
-            "Device command: device_id=%s, endpoint_id=%s, connector_id=%s, "
-            "signal_type=%s, engineering=%s, raw=%s, address=%s",
-            device.id,
-            endpoint.id,
-            endpoint.connector_id,
-            signal_type,
-            engineering_value,
-            raw_value,
-            endpoint.address,
-        )
-        # TODO: enqueue Celery task or background write here
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Device command: device_id=%s, endpoint_id=%s, connector_id=%s, "
+                "signal_type=%s, engineering=%s, raw=%s, address=%s",
+                device.id,
+                endpoint.id,
+                spec.connector_id,
+                signal_type,
+                engineering_value,
+                raw_value,
+                spec.address,
+            )
 
-        # 3) Update device state for UI feedback
-        device.last_value = (
-            engineering_value
-            if isinstance(engineering_value, (int, float))
-            else None
-        )
-        device.last_value_raw = str(raw_value)
-        device.last_updated_at = timezone.now()
-
-        if signal_type == "digital":
-            device.is_on = bool(engineering_value == 1.0)
-
-        device.save(
-            update_fields=[
-                "last_value",
-                "last_value_raw",
-                "last_updated_at",
-                "is_on",
-            ]
-        )
+        # 3) Update device state for UI feedback: one UPDATE keyed on
+        # the pk — ownership was already enforced when the device was
+        # fetched, and skipping save() avoids the model-instance write
+        # machinery (signals, field iteration) on the hot actuator path.
+        state_update = {
+            "last_value": (
+                engineering_value
+                if isinstance(engineering_value, (int, float))
+                else None
+            ),
+            "last_value_raw": str(raw_value),
+            "last_updated_at": timezone.now(),
+        }
+        if signal_type == Device.SignalType.DIGITAL:
+            state_update["is_on"] = bool(engineering_value == 1.0)
+
+        DeviceState.objects.filter(pk=device.pk).update(**state_update)
+
+        # Reflect the write on the in-memory state for the response.
+        for field, value in state_update.items():
+            setattr(device.state, field, value)
+
+        # Slim ack by default: exactly the state fields the UI merges
+        # into its local copy, no nested room/endpoint serialization.
+        # ?full=1 returns the complete device for callers that need it.
+        if request.query_params.get("full"):
+            return Response(
+                self.get_serializer(device).data, status=status.HTTP_200_OK
+            )
 
-        # Return updated device
-        serializer = self.get_serializer(device)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        device_state = device.state
+        return Response(
+            {
+                "id": device.id,
+                "is_on": device_state.is_on,
+                "last_value": device_state.last_value,
+                "last_value_raw": device_state.last_value_raw,
+                "last_updated_at": (
+                    device_state.last_updated_at.isoformat()
+                    if device_state.last_updated_at
+                    else None
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
 # --------------------------------------------------------------------
@@ -341,36 +617,60 @@ class IntegrationViewSet(viewsets.ModelViewSet):
     serializer_class = IntegrationSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return IntegrationListSerializer
+        return IntegrationSerializer
+
     def get_queryset(self):
-        return Integration.objects.filter(owner=self.request.user)
+        queryset = optimize_queryset(
+            Integration.objects.filter(owner=self.request.user),
+            self.get_serializer_class(),
+        )
+        if self.action == "list":
+            # Tokens and metadata JSON are never rendered in lists.
+            queryset = queryset.defer("access_token", "refresh_token", "metadata")
+        return queryset
 
     def perform_create(self, serializer):
         integration = serializer.save(owner=self.request.user)
-        logger.info(
-            "Integration created: %s (provider=%s, user=%s)",
-            integration.display_name,
-            integration.provider,
-            self.request.user.username,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Integration created: %s (provider=%s, user=%s)",
+                integration.display_name,
+                integration.provider,
+                self.request.user.username,
+            )
 
     def perform_update(self, serializer):
         integration = serializer.save()
-        logger.info(
-            "Integration updated: %s (provider=%s, user=%s)",
-            integration.display_name,
-            integration.provider,
-            self.request.user.username,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Integration updated: %s (provider=%s, user=%s)",
+                integration.display_name,
+                integration.provider,
+                self.request.user.username,
+            )
 
     @action(detail=False, methods=["GET"])
     def summary(self, request):
         """
         Simple provider count summary.
+
+        Counted by the database with one GROUP BY over the (owner,
+        provider) index — one row per provider comes back instead of
+        every integration row.
         """
-        providers = {}
-        for integration in self.get_queryset():
-            providers.setdefault(integration.provider, 0)
-            providers[integration.provider] += 1
+        rows = (
+            Integration.objects.filter(owner=request.user)
+            .values("provider")
+            .annotate(count=Count("id"))
+            # Clear the model's -created_at ordering, which would leak
+            # into the GROUP BY and split the groups per timestamp.
+            .order_by()
+        )
+        slugs = Integration.Provider.slug_map()
+        providers = {slugs[row["provider"]]: row["count"] for row in rows}
         return Response({"providers": providers})
 
 
@@ -387,26 +687,48 @@ class ConnectorViewSet(viewsets.ModelViewSet):
     serializer_class = ConnectorSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
 
+    def get_serializer_class(self):
+        if self.action == "list":
+            return ConnectorListSerializer
+        return ConnectorSerializer
+
     def get_queryset(self):
-        return Connector.objects.filter(owner=self.request.user)
+        queryset = optimize_queryset(
+            Connector.objects.filter(owner=self.request.user),
+            self.get_serializer_class(),
+        )
+        if self.action == "list":
+            # The joined integration row is rendered by its slim list
+            # serializer, so its token/metadata blobs can stay behind
+            # along with the connector's own.
+            queryset = queryset.defer(
+                "password",
+                "config",
+                "integration__access_token",
+                "integration__refresh_token",
+                "integration__metadata",
+            )
+        return queryset
 
     def perform_create(self, serializer):
         connector = serializer.save(owner=self.request.user)
-        logger.info(
-            "Connector created: %s (type=%s, user=%s)",
-            connector.name,
-            connector.connector_type,
-            self.request.user.username,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Connector created: %s (type=%s, user=%s)",
+                connector.name,
+                connector.connector_type,
+                self.request.user.username,
+            )
 
     def perform_update(self, serializer):
         connector = serializer.save()
-        logger.info(
-            "Connector updated: %s (type=%s, user=%s)",
-            connector.name,
-            connector.connector_type,
-            self.request.user.username,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Connector updated: %s (type=%s, user=%s)",
+                connector.name,
+                connector.connector_type,
+                self.request.user.username,
+            )
 
 
 # --------------------------------------------------------------------
@@ -423,61 +745,106 @@ class DeviceEndpointViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsOwner]
 
     def get_queryset(self):
-        return DeviceEndpoint.objects.filter(
-            device__room__owner=self.request.user
-        ).select_related("device", "connector", "integration")
+        # device is exposed as a plain PK, so the optimizer won't join
+        # it; the permission checks still walk device→room→owner.
+        return optimize_queryset(
+            DeviceEndpoint.objects.filter(device__owner=self.request.user),
+            self.get_serializer_class(),
+        ).select_related("device", "device__room", "device__room__owner")
+
+    @action(detail=False, methods=["POST"])
+    def bulk(self, request):
+        """
+        Create many endpoints in one request (hybrids typically bind an
+        input and an output pair per device). Validates every row, runs
+        the same ownership checks as single creates, then inserts with
+        bulk_create in batches of 500.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        for item in serializer.validated_data:
+            self._check_ownership(
+                item["device"],
+                item["connector"],
+                item.get("integration"),
+            )
 
-    def perform_create(self, serializer):
-        device = serializer.validated_data["device"]
-        connector = serializer.validated_data["connector"]
-        integration = serializer.validated_data.get("integration")
+        # bulk_create skips the pre_save inv_scale sync.
+        rows = [DeviceEndpoint(**item) for item in serializer.validated_data]
+        for endpoint in rows:
+            endpoint.inv_scale = 1.0 / endpoint.scale if endpoint.scale else 1.0
+        with transaction.atomic():
+            endpoints = DeviceEndpoint.objects.bulk_create(rows, batch_size=500)
+        logger.info(
+            "DeviceEndpoints bulk-created: count=%s, user=%s",
+            len(endpoints),
+            request.user.username,
+        )
+        return Response(
+            self.get_serializer(endpoints, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    def _check_ownership(self, device, connector, integration):
+        # Compare the FK columns already on the validated objects; going
+        # through .room.owner / .owner would lazy-load full related rows
+        # just to compare primary keys.
+        user_pk = self.request.user.pk
 
-        # Ownership checks
-        if device.room.owner != self.request.user:
+        if device.owner_id != user_pk:
             logger.warning(
-                "User %s tried to create endpoint for device in room owned by %s",
+                "User %s tried to create endpoint for device %s they do not own",
                 self.request.user.username,
-                device.room.owner.username,
+                device.pk,
             )
             raise permissions.PermissionDenied("You do not own this device/room")
 
-        if connector.owner != self.request.user:
+        if connector.owner_id != user_pk:
             logger.warning(
-                "User %s tried to bind endpoint to connector owned by %s",
+                "User %s tried to bind endpoint to connector %s they do not own",
                 self.request.user.username,
-                connector.owner.username,
+                connector.pk,
             )
             raise permissions.PermissionDenied("You do not own this connector")
 
-        if integration and integration.owner != self.request.user:
+        if integration and integration.owner_id != user_pk:
             logger.warning(
-                "User %s tried to bind endpoint to integration owned by %s",
+                "User %s tried to bind endpoint to integration %s they do not own",
                 self.request.user.username,
-                integration.owner.username,
+                integration.pk,
             )
             raise permissions.PermissionDenied("You do not own this integration")
 
-        endpoint = serializer.save()
-        logger.info(
-            "DeviceEndpoint created: device=%s, connector=%s, direction=%s, address=%s, user=%s",
-            endpoint.device_id,
-            endpoint.connector_id,
-            endpoint.direction,
-            endpoint.address,
-            self.request.user.username,
+    def perform_create(self, serializer):
+        self._check_ownership(
+            serializer.validated_data["device"],
+            serializer.validated_data["connector"],
+            serializer.validated_data.get("integration"),
         )
+        endpoint = serializer.save()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "DeviceEndpoint created: device=%s, connector=%s, direction=%s, address=%s, user=%s",
+                endpoint.device_id,
+                endpoint.connector_id,
+                endpoint.direction,
+                endpoint.address,
+                self.request.user.username,
+            )
 
     def perform_update(self, serializer):
         endpoint = serializer.save()
-        logger.info(
-            "DeviceEndpoint updated: id=%s, device=%s, connector=%s, direction=%s, address=%s, user=%s",
-            endpoint.id,
-            endpoint.device_id,
-            endpoint.connector_id,
-            endpoint.direction,
-            endpoint.address,
-            self.request.user.username,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "DeviceEndpoint updated: id=%s, device=%s, connector=%s, direction=%s, address=%s, user=%s",
+                endpoint.id,
+                endpoint.device_id,
+                endpoint.connector_id,
+                endpoint.direction,
+                endpoint.address,
+                self.request.user.username,
+            )
 
 
 # --------------------------------------------------------------------
@@ -485,38 +852,40 @@ class DeviceEndpointViewSet(viewsets.ModelViewSet):
 # --------------------------------------------------------------------
 
 
+@cache_page(30, key_prefix="dash")
+@vary_on_headers("Authorization")
 @api_view(["GET"])
 def dashboard_summary(request):
     """
     Simple summary for the dashboard.
 
-    Wrapped in try/except so if anything goes wrong (e.g. DB not migrated),
-    we log the error instead of blowing up silently in the frontend.
+    Cached for 30s per Authorization header, so dashboard refreshes
+    between writes are served from Redis without touching the database.
+
+    Two round-trips: one aggregate over devices (total + on, via a
+    conditional Count) and one over the user's rooms/integrations,
+    instead of a COUNT query per number.
     """
-    try:
-        user = request.user
-        rooms = Room.objects.filter(owner=user).count()
-        devices = Device.objects.filter(room__owner=user).count()
-        on_devices = Device.objects.filter(room__owner=user, is_on=True).count()
-        integrations = Integration.objects.filter(owner=user).count()
+    user = request.user
+    device_counts = Device.objects.filter(owner=user).aggregate(
+        total=Count("id"),
+        on=Count("id", filter=Q(state__is_on=True)),
+    )
+    # Joining both relations multiplies rows, so both counts are over
+    # distinct ids; row counts here are tiny.
+    owned_counts = User.objects.filter(pk=user.pk).aggregate(
+        room_count=Count("rooms", distinct=True),
+        integration_count=Count("integrations", distinct=True),
+    )
 
-        return Response(
-            {
-                "rooms": rooms,
-                "devices": devices,
-                "on_devices": on_devices,
-                "integrations": integrations,
-            }
-        )
-    except Exception:
-        logger.exception(
-            "Error computing dashboard summary for user %s",
-            request.user,
-        )
-        return Response(
-            {"detail": "Failed to load dashboard summary."},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
+    return Response(
+        {
+            "rooms": owned_counts["room_count"],
+            "devices": device_counts["total"],
+            "on_devices": device_counts["on"],
+            "integrations": owned_counts["integration_count"],
+        }
+    )
 
 
 # --------------------------------------------------------------------
@@ -527,15 +896,20 @@ def dashboard_summary(request):
 def _resolve_primary_output_endpoint(device):
     """
     Helper: find the primary output endpoint for this device, if any.
+
+    Iterates device.endpoints.all() so the prefetched endpoint list from
+    the viewset queryset is reused; .filter() on the manager would
+    bypass the prefetch cache and hit the database again per command.
     """
-    endpoints = getattr(device, "endpoints", None)
-    if endpoints is None:
+    outputs = [
+        endpoint
+        for endpoint in device.endpoints.all()
+        if endpoint.direction == DeviceEndpoint.Direction.OUTPUT
+    ]
+    if not outputs:
         return None
 
-    # Prefer primary output endpoint
-    primary = endpoints.filter(direction="output", is_primary=True).first()
-    if primary:
-        return primary
-
-    # Fallback: any output endpoint
-    return endpoints.filter(direction="output").first()
\ No newline at end of file
+    # Prefer primary output endpoint, fall back to any output
+    return next(
+        (endpoint for endpoint in outputs if endpoint.is_primary), outputs[0]
+    )
\ No newline at end of file
@@ -45,6 +45,15 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Same Redis instance as the channel layer, separate database. Uses the
+# built-in redis backend (redis-py already ships via channels-redis).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("DJANGO_CACHE_URL", "redis://redis:6379/1"),
+    },
+}
+
 ROOT_URLCONF = 'home_automation_backend.urls'
 
 TEMPLATES = [
@@ -69,6 +78,10 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections alive between requests / worker writes instead
+        # of reconnecting per operation; health checks recycle dead ones.
+        'CONN_MAX_AGE': int(os.environ.get("DJANGO_DB_CONN_MAX_AGE", "600")),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -86,7 +99,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        # TokenAuthentication behind a short Redis cache, so steady-state
+        # requests skip the per-request token SELECT.
+        'automation.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
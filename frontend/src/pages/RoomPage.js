@@ -165,6 +165,15 @@ const RoomPage = () => {
           setDevices((prev) => applyDeviceUpdate(prev, data.device));
         }
 
+        if (data.type === "device_updates_batch" && Array.isArray(data.updates)) {
+          setDevices((prev) =>
+            data.updates.reduce(
+              (acc, update) => applyDeviceUpdate(acc, update),
+              prev
+            )
+          );
+        }
+
         if (data.type === "devices_snapshot" && Array.isArray(data.devices)) {
           setDevices(data.devices);
         }
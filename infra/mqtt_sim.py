@@ -1,52 +1,62 @@
+import asyncio
+import logging
 import os
-import time
 import random
-import json
+import time
 
-import paho.mqtt.client as mqtt
+import aiomqtt
+import orjson
+
+logger = logging.getLogger("mqtt_sim")
 
 MQTT_HOST = os.getenv("MQTT_HOST", "mqtt")
 MQTT_PORT = int(os.getenv("MQTT_PORT", "1883"))
-
-client = mqtt.Client(client_id="home_automation_sim")
-
-def main():
-    client.connect(MQTT_HOST, MQTT_PORT, keepalive=60)
-    client.loop_start()
-
-    print(f"[mqtt-sim] Connected to MQTT at {MQTT_HOST}:{MQTT_PORT}")
-
-    while True:
-        # A couple of fake sensors
-        payloads = [
-            {
-                "topic": "sensors/living_room/temperature",
-                "value": round(random.uniform(20.0, 24.0), 1),
-                "unit": "°C",
-            },
-            {
-                "topic": "sensors/living_room/humidity",
-                "value": round(random.uniform(30.0, 50.0), 1),
-                "unit": "%",
-            },
-            {
-                "topic": "sensors/bedroom/co2",
-                "value": random.randint(400, 900),
-                "unit": "ppm",
-            },
-        ]
-
-        for p in payloads:
-          msg = {
-              "value": p["value"],
-              "unit": p["unit"],
-              "ts": time.time(),
-          }
-          client.publish(p["topic"], json.dumps(msg), qos=0, retain=False)
-          print(f"[mqtt-sim] Published {msg} to {p['topic']}")
-
-        time.sleep(5)
+PUBLISH_INTERVAL = 5.0
+
+# Static sensor definitions hoisted out of the loop: topic, unit and a
+# value factory. Per tick only value/ts change.
+SENSORS = (
+    (
+        "sensors/living_room/temperature",
+        "°C",
+        lambda: round(random.uniform(20.0, 24.0), 1),
+    ),
+    (
+        "sensors/living_room/humidity",
+        "%",
+        lambda: round(random.uniform(30.0, 50.0), 1),
+    ),
+    (
+        "sensors/bedroom/co2",
+        "ppm",
+        lambda: random.randint(400, 900),
+    ),
+)
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO, format="[mqtt-sim] %(message)s")
+    async with aiomqtt.Client(hostname=MQTT_HOST, port=MQTT_PORT) as client:
+        logger.info("Connected to MQTT at %s:%s", MQTT_HOST, MQTT_PORT)
+        while True:
+            # One timestamp per tick; the three publishes go out
+            # concurrently, so a slow broker write doesn't serialize the
+            # tick or stall the sampling cadence.
+            now = time.time()
+            payloads = [
+                (topic, {"value": make_value(), "unit": unit, "ts": now})
+                for topic, unit, make_value in SENSORS
+            ]
+            await asyncio.gather(
+                *[
+                    client.publish(topic, orjson.dumps(msg), qos=0)
+                    for topic, msg in payloads
+                ]
+            )
+            for topic, msg in payloads:
+                logger.info("Published %s to %s", msg, topic)
+            await asyncio.sleep(PUBLISH_INTERVAL)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
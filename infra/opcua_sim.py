@@ -1,6 +1,7 @@
 import asyncio
 import random
 import time
+from datetime import datetime, timezone
 
 from asyncua import ua, Server
 
@@ -63,11 +64,43 @@ async def main():
             # CO2 as Double
             co2_value = 500.0 + random.uniform(-50.0, 150.0)
 
-            await temp.write_value(ua.Variant(temp_value, ua.VariantType.Double))
-            await humidity.write_value(ua.Variant(humidity_value, ua.VariantType.Double))
-            await co2.write_value(ua.Variant(co2_value, ua.VariantType.Double))
-            await occupancy.write_value(
-                ua.Variant(random.choice([True, False]), ua.VariantType.Boolean)
+            # Write server-side attribute values directly (no per-write
+            # OPC UA service request like node.write_value) with one
+            # shared SourceTimestamp, and overlap the four updates so
+            # subscribers get them in a single notification cycle.
+            stamp = datetime.now(timezone.utc)
+            await asyncio.gather(
+                server.write_attribute_value(
+                    temp.nodeid,
+                    ua.DataValue(
+                        ua.Variant(temp_value, ua.VariantType.Double),
+                        SourceTimestamp=stamp,
+                    ),
+                ),
+                server.write_attribute_value(
+                    humidity.nodeid,
+                    ua.DataValue(
+                        ua.Variant(humidity_value, ua.VariantType.Double),
+                        SourceTimestamp=stamp,
+                    ),
+                ),
+                server.write_attribute_value(
+                    co2.nodeid,
+                    ua.DataValue(
+                        ua.Variant(co2_value, ua.VariantType.Double),
+                        SourceTimestamp=stamp,
+                    ),
+                ),
+                server.write_attribute_value(
+                    occupancy.nodeid,
+                    ua.DataValue(
+                        ua.Variant(
+                            random.choice([True, False]),
+                            ua.VariantType.Boolean,
+                        ),
+                        SourceTimestamp=stamp,
+                    ),
+                ),
             )
 
             print(